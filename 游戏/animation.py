@@ -0,0 +1,72 @@
+# animation.py
+import os
+import pygame
+import assets
+from utils import load_sprite_sheets
+
+# 动画状态（整数，直接作为动画表的键）
+IDLE = 0
+RUN = 1
+JUMP = 2
+WALK = 3
+STOMPED = 4
+
+# 朝向，同时也是水平移动的符号
+LEFT = -1
+RIGHT = 1
+
+PLAYER_TICKS_PER_FRAME = 5  # 角色每帧图片持续的 tick 数
+ENEMY_TICKS_PER_FRAME = 8   # 敌人每帧图片持续的 tick 数
+
+
+class Clip:
+    """一段动画：帧序列和每帧持续的 tick 数；帧下标只用整数运算得到"""
+    __slots__ = ("frames", "ticks_per_frame", "period")
+
+    def __init__(self, frames, ticks_per_frame=1):
+        self.frames = tuple(frames)
+        self.ticks_per_frame = ticks_per_frame
+        self.period = ticks_per_frame * len(self.frames)  # 播放一遍需要的 tick 数
+
+    def frame(self, tick):
+        """第 tick 个 tick 应显示的图片（循环播放）"""
+        return self.frames[tick % self.period // self.ticks_per_frame]
+
+
+def player_clips():
+    """马里奥的动画表 {状态: {朝向: Clip}}，所有实例共享"""
+    return assets.cached(("clips", "Mario"), _build_player_clips)
+
+
+def _build_player_clips():
+    sheets = load_sprite_sheets("MainCharacters", "Mario", 16, 16, True)
+    return {state: {LEFT: Clip(sheets[f"{name}_left"], PLAYER_TICKS_PER_FRAME),
+                    RIGHT: Clip(sheets[f"{name}_right"], PLAYER_TICKS_PER_FRAME)}
+            for state, name in ((IDLE, "idle"), (RUN, "run"), (JUMP, "jump"))}
+
+
+def enemy_clips(width, height):
+    """蘑菇怪的动画表 {状态: {朝向: Clip}}（width、height 为缩放后的像素尺寸），同尺寸的敌人共享"""
+    return assets.cached(("clips", "Goombas", width, height), lambda: _build_enemy_clips(width, height))
+
+
+def _build_enemy_clips(width, height):
+    try:
+        # 向右走（第一帧）、向左走（第二帧）、被踩扁（第三帧）
+        image_path = os.path.join("assets", "Enemies", "Goombas.png")
+        walk_right, walk_left, stomped = assets.load_frames(image_path, 3, (width, height))
+    except Exception as e:
+        # 加载失败时使用纯色方块
+        print(f"警告: 加载敌人图片失败: {e}")
+        walk_right, walk_left, stomped = (_solid(width, height, color)
+                                          for color in ((0, 128, 0), (0, 64, 0), (128, 0, 0)))
+    return {WALK: {LEFT: Clip((walk_left,), ENEMY_TICKS_PER_FRAME),
+                   RIGHT: Clip((walk_right,), ENEMY_TICKS_PER_FRAME)},
+            STOMPED: {LEFT: Clip((stomped,)), RIGHT: Clip((stomped,))}}
+
+
+def _solid(width, height, color):
+    """纯色精灵，用于图片加载失败时"""
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
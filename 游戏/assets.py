@@ -0,0 +1,101 @@
+# assets.py
+import pygame
+
+# 进程级资源缓存：同一个 (路径, 尺寸, 翻转) 只加载、转换、缩放一次，
+# 所有方块、敌人和玩家共享同一个 Surface 对象
+_cache = {}
+
+
+def image_key(path, size=None, flip=False):
+    """load_image 使用的缓存键"""
+    return ("image", path, size, flip)
+
+
+def frames_key(path, count, size=None, flip=False):
+    """load_frames 使用的缓存键"""
+    return ("frames", path, count, size, flip)
+
+
+def custom_key(key):
+    """cached 使用的缓存键"""
+    return ("custom",) + tuple(key)
+
+
+def load_image(path, size=None, flip=False):
+    """加载图片并按 (路径, 尺寸, 翻转) 缓存"""
+    key = image_key(path, size, flip)
+    image = _cache.get(key)
+    if image is None:
+        if size is None and not flip:
+            image = pygame.image.load(path)
+            # 无窗口（纯逻辑模拟）时无法转换像素格式，直接使用原图
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        else:
+            image = load_image(path)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            if flip:
+                image = pygame.transform.flip(image, True, False)
+        _cache[key] = image
+    return image
+
+
+def load_frames(path, count, size=None, flip=False):
+    """把水平排列的精灵表切成 count 帧，缩放/翻转后以元组形式缓存"""
+    key = frames_key(path, count, size, flip)
+    frames = _cache.get(key)
+    if frames is None:
+        sheet = load_image(path)
+        frame_width = sheet.get_width() // count
+        frame_height = sheet.get_height()
+        frames = []
+        for i in range(count):
+            frame = sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height))
+            if size is not None:
+                frame = pygame.transform.scale(frame, size)
+            else:
+                frame = frame.copy()
+            if flip:
+                frame = pygame.transform.flip(frame, True, False)
+            frames.append(frame)
+        frames = tuple(frames)
+        _cache[key] = frames
+    return frames
+
+
+def cached(key, factory):
+    """通用缓存入口：key 不存在时调用 factory() 生成并保存"""
+    key = custom_key(key)
+    value = _cache.get(key)
+    if value is None:
+        value = factory()
+        _cache[key] = value
+    return value
+
+
+def store(key, value):
+    """直接放入缓存（例如从图集文件恢复的资源），之后按同样的键加载时直接命中"""
+    _cache[key] = value
+
+
+def preload(images=(), frames=()):
+    """预加载资源（images 为 load_image 的参数元组，frames 为 load_frames 的参数元组）"""
+    for args in images:
+        load_image(*args)
+    for args in frames:
+        load_frames(*args)
+
+
+def evict(path=None):
+    """释放缓存；不传路径时清空全部，否则只释放与该路径相关的条目"""
+    if path is None:
+        _cache.clear()
+        return
+    for key in [k for k in _cache if path in k]:
+        del _cache[key]
+
+
+def cache_size():
+    """当前缓存条目数"""
+    return len(_cache)
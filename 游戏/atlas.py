@@ -0,0 +1,172 @@
+# atlas.py
+import os
+import json
+import mmap
+import pygame
+import assets
+from utils import load_sprite_sheets, sprite_sheets_key
+from constants import BLOCK_SIZE, CHARACTER_SCALE
+
+# 预烘焙图集：所有缩放、翻转好的帧打包成一张原始 RGBA 像素文件和一个 JSON 索引。
+# 启动时直接映射像素文件并切出子 Surface 放进资源缓存，不再逐个解码、切割、缩放 PNG。
+VERSION = 1
+ATLAS_DIR = os.path.join("assets", ".atlas")
+PIXELS_PATH = os.path.join(ATLAS_DIR, "sprites.rgba")
+INDEX_PATH = os.path.join(ATLAS_DIR, "sprites.json")
+ATLAS_WIDTH = 1024
+
+CHARACTER_SIZE = (16 * CHARACTER_SCALE, 16 * CHARACTER_SCALE)
+MARIO = ("MainCharacters", "Mario", 16, 16, True)
+GOOMBAS = (os.path.join("assets", "Enemies", "Goombas.png"), 3, CHARACTER_SIZE)
+DEATH = (os.path.join("assets", "MainCharacters", "Mario", "death.png"), CHARACTER_SIZE)
+GROUND = (os.path.join("assets", "Terrain", "Ground.png"), (BLOCK_SIZE, BLOCK_SIZE))
+
+_mapping = None  # 当前使用的像素文件映射（子 Surface 引用其中的内存）
+
+
+def _entries():
+    """图集包含的资源：(缓存键, 加载函数)，顺序即索引中的顺序"""
+    return [
+        (assets.custom_key(sprite_sheets_key(*MARIO)), lambda: load_sprite_sheets(*MARIO)),
+        (assets.frames_key(*GOOMBAS), lambda: assets.load_frames(*GOOMBAS)),
+        (assets.image_key(*DEATH), lambda: assets.load_image(*DEATH)),
+        (assets.image_key(*GROUND), lambda: assets.load_image(*GROUND)),
+    ]
+
+
+def _sources():
+    """图集依赖的源图片及其修改时间"""
+    mario = os.path.join("assets", MARIO[0], MARIO[1])
+    paths = [os.path.join(mario, f) for f in os.listdir(mario) if os.path.isfile(os.path.join(mario, f))]
+    paths += [GOOMBAS[0], GROUND[0]]
+    return {path: os.stat(path).st_mtime_ns for path in sorted(paths)}
+
+
+def _signature():
+    """决定图集是否过期的全部信息"""
+    return {"version": VERSION, "scale": CHARACTER_SCALE, "block_size": BLOCK_SIZE, "sources": _sources()}
+
+
+def load_sources():
+    """按原来的方式逐个加载（解码、切割、缩放、翻转）图集中的全部资源"""
+    return [(key, load()) for key, load in _entries()]
+
+
+def _pack(surfaces):
+    """按行摆放（高的在前），返回每个 Surface 的 [x, y, 宽, 高] 和图集尺寸"""
+    order = sorted(range(len(surfaces)), key=lambda i: -surfaces[i].get_height())
+    rects = [None] * len(surfaces)
+    x = y = row_height = 0
+    for i in order:
+        w, h = surfaces[i].get_size()
+        if x + w > ATLAS_WIDTH:
+            x, y, row_height = 0, y + row_height, 0
+        rects[i] = [x, y, w, h]
+        x += w
+        row_height = max(row_height, h)
+    return rects, (ATLAS_WIDTH, y + row_height)
+
+
+def build():
+    """烘焙图集文件，返回索引"""
+    signature = _signature()
+    loaded = load_sources()
+
+    # 把各种形状的资源展开成一列 Surface，索引里记录如何还原
+    surfaces = []
+
+    def place(surface):
+        surfaces.append(surface)
+        return len(surfaces) - 1
+
+    layout = []
+    for key, value in loaded:
+        if isinstance(value, dict):
+            layout.append({"key": repr(key), "kind": "sheets",
+                           "frames": {name: [place(s) for s in frames] for name, frames in value.items()}})
+        elif isinstance(value, tuple):
+            layout.append({"key": repr(key), "kind": "frames", "frames": [place(s) for s in value]})
+        else:
+            layout.append({"key": repr(key), "kind": "image", "frames": place(value)})
+
+    rects, size = _pack(surfaces)
+    sheet = pygame.Surface(size, pygame.SRCALPHA, 32)
+    for surface, (x, y, w, h) in zip(surfaces, rects):
+        sheet.blit(surface, (x, y))
+
+    index = dict(signature, size=list(size), rects=rects, entries=layout)
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    # 先写临时文件再替换，避免中途失败留下不完整的图集
+    with open(PIXELS_PATH + ".tmp", "wb") as f:
+        f.write(pygame.image.tobytes(sheet, "RGBA"))
+    with open(INDEX_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(PIXELS_PATH + ".tmp", PIXELS_PATH)
+    os.replace(INDEX_PATH + ".tmp", INDEX_PATH)
+    return index
+
+
+def _read_index():
+    """读取索引；不存在或已过期（源图片、缩放比例或格式变化）时返回 None"""
+    try:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            index = json.load(f)
+        signature = _signature()
+    except (OSError, ValueError):
+        return None
+    if any(index.get(name) != value for name, value in signature.items()):
+        return None
+    if [entry["key"] for entry in index["entries"]] != [repr(key) for key, _ in _entries()]:
+        return None
+    return index
+
+
+def load():
+    """从图集文件恢复资源到缓存；图集不存在或已过期时返回 False"""
+    global _mapping
+    index = _read_index()
+    if index is None:
+        return False
+    size = tuple(index["size"])
+    try:
+        with open(PIXELS_PATH, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return False
+    if len(mapping) != size[0] * size[1] * 4:
+        return False
+    sheet = pygame.image.frombuffer(mapping, size, "RGBA")
+    if pygame.display.get_surface() is not None:
+        sheet = sheet.convert_alpha()
+    _mapping = mapping
+
+    frames = [sheet.subsurface(rect) for rect in index["rects"]]
+    for (key, _), entry in zip(_entries(), index["entries"]):
+        if entry["kind"] == "sheets":
+            value = {name: [frames[i] for i in ids] for name, ids in entry["frames"].items()}
+        elif entry["kind"] == "frames":
+            value = tuple(frames[i] for i in entry["frames"])
+        else:
+            value = frames[entry["frames"]]
+        assets.store(key, value)
+    return True
+
+
+def install():
+    """启动时调用：优先加载图集，没有或过期时重新烘焙；写不了文件就按原方式加载"""
+    if load():
+        return True
+    try:
+        build()
+    except OSError as e:
+        print(f"警告: 无法写入图集缓存: {e}")
+        load_sources()
+        return False
+    return load()
+
+
+if __name__ == "__main__":
+    # 单独运行时强制重新烘焙
+    pygame.init()
+    index = build()
+    print(f"图集已生成: {PIXELS_PATH} {index['size'][0]}x{index['size'][1]}，{len(index['rects'])} 帧")
@@ -0,0 +1,555 @@
+# benchmark.py
+import os
+import sys
+import gc
+import json
+import random
+import argparse
+import platform
+import subprocess
+import time
+import tracemalloc
+
+# 无窗口运行（需在导入 pygame 之前设置）
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import assets
+import atlas
+import savestate
+from block import Block
+from enemy import Enemy
+from player import Player
+from spatial import SpatialGrid, LINEAR_SCAN_LIMIT
+from tilemap import TileMap
+from render import Renderer
+from hud import HUD
+from world import World, InputState
+from main import draw
+from pipeline import RenderThread, capture
+from pacing import FramePacer
+from swarm import np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BLOCK_SIZE, CHARACTER_SCALE, SCORE_TO_INCREASE_DIFFICULTY, FPS, MAX_FRAME_SKIP
+
+
+class LinearBlocks:
+    """与 SpatialGrid 接口相同的线性扫描版本，作为对照组"""
+
+    def __init__(self, blocks):
+        self.blocks = list(blocks)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def query(self, rect):
+        return self.blocks
+
+    def collide_any(self, rect):
+        for block in self.blocks:
+            if rect.colliderect(block.rect):
+                return True
+        return False
+
+
+def init_headless():
+    """初始化无窗口的 pygame 环境"""
+    pygame.init()
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def build_tilemap(rng, num_platforms=5):
+    """生成固定种子的测试关卡：地面加若干平台"""
+    tilemap = TileMap()
+    tilemap.fill(0, tilemap.rows - 1, tilemap.cols)
+    for _ in range(num_platforms):
+        length = rng.randint(3, 10)
+        tilemap.fill(rng.randint(0, tilemap.cols - length), rng.randint(4, tilemap.rows - 3), length)
+    return tilemap
+
+
+def scatter_blocks(rng, count):
+    """地面加 count - 1 个随机位置的单格方块
+
+    合并后的真实关卡方块很少，都在 LINEAR_SCAN_LIMIT 以内，这里用不合并的单格方块凑出任意数量。
+    """
+    tilemap = TileMap()
+    size = tilemap.tile_size
+    cells = rng.sample([(col, row) for row in range(4, tilemap.rows - 1) for col in range(tilemap.cols)], count - 1)
+    ground = Block(0, tilemap.row_top(tilemap.rows - 1), tilemap.width, size, tile_size=size)
+    return [ground] + [Block(col * size, tilemap.row_top(row), size, size) for col, row in cells]
+
+
+def build_tile_blocks(tilemap):
+    """旧的关卡表示：每个瓦片一个 Block，作为对照组"""
+    size = tilemap.tile_size
+    return [Block(col * size, tilemap.row_top(row), size, size)
+            for col, row, length, tile in tilemap.spans()
+            for col in range(col, col + length)]
+
+
+def spawn_enemies(rng, count):
+    """在地面上随机位置生成敌人"""
+    size = int(16 * CHARACTER_SCALE)
+    return [Enemy(rng.randint(0, SCREEN_WIDTH - size), SCREEN_HEIGHT - BLOCK_SIZE - size, 16, 16)
+            for _ in range(count)]
+
+
+def bench_collision(counts=(10, 100, 1000), block_counts=(6, 24, 64, 256), frames=120, seed=0):
+    """比较线性扫描与网格索引下每帧地形碰撞的耗时（毫秒）
+
+    网格一列强制走网格查询，不受 LINEAR_SCAN_LIMIT 影响；真实关卡约 6（单屏）到 24（滚动）个方块。
+    """
+    results = []
+    for num_blocks in block_counts:
+        for count in counts:
+            results.append(_bench_collision_case(count, num_blocks, frames, seed))
+    return results
+
+
+def _bench_collision_case(count, num_blocks, frames, seed):
+    row = {"enemies": count, "blocks": num_blocks, "uses_grid": num_blocks > LINEAR_SCAN_LIMIT}
+    indexes = (("linear", LinearBlocks), ("grid", lambda blocks: SpatialGrid(blocks, linear=False)))
+    for name, index in indexes:
+        rng = random.Random(seed)
+        blocks = index(scatter_blocks(rng, num_blocks))
+        enemies = spawn_enemies(rng, count)
+        player = Player(100, SCREEN_HEIGHT - BLOCK_SIZE - int(16 * CHARACTER_SCALE), 16, 16)
+        start = time.perf_counter()
+        for _ in range(frames):
+            player.velocity_y += 1
+            player.rect.y += 1
+            player.handle_collision("y", blocks)
+            for enemy in enemies:
+                enemy.move(blocks, SCREEN_WIDTH)
+        row[name] = (time.perf_counter() - start) * 1000 / frames
+    return row
+
+
+def bench_level_build(platform_counts=(5, 40), repeats=50, seed=0):
+    """比较每瓦片一个 Block 与瓦片地图两种关卡表示的重建耗时和对象数"""
+    results = []
+    for num_platforms in platform_counts:
+        tilemap = build_tilemap(random.Random(seed), num_platforms)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            tile_blocks = SpatialGrid(build_tile_blocks(tilemap))
+        per_tile = (time.perf_counter() - start) * 1000 / repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            rebuilt = TileMap()
+            rebuilt.tiles = [bytearray(line) for line in tilemap.tiles]
+            span_blocks = rebuilt.grid
+        merged = (time.perf_counter() - start) * 1000 / repeats
+        results.append({"platforms": num_platforms,
+                        "tile_objects": len(tile_blocks), "tile_ms": per_tile,
+                        "span_objects": len(span_blocks), "span_ms": merged})
+    return results
+
+
+RESTART_INTERVAL = 600  # 输入脚本每隔这么多帧按一次重新开始键（只在游戏结束后起作用，玩家无敌的场景不受影响）
+
+
+def scripted_input(tick):
+    """固定的输入脚本：左右往返并周期性跳跃（基准测试和测试共用）"""
+    right = (tick // 90) % 2 == 0
+    return InputState(not right, right, tick % 40 < 3, tick % RESTART_INTERVAL == RESTART_INTERVAL - 1)
+
+
+def run_right(tick):
+    """一直向右跑并周期性跳跃（滚动场景）"""
+    return InputState(False, True, tick % 30 < 3, tick % RESTART_INTERVAL == RESTART_INTERVAL - 1)
+
+
+def percentiles(samples):
+    """毫秒样本的 p50/p95/p99/最大值"""
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q):
+        return ordered[min(last, int(round(q * last)))]
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99),
+            "max": ordered[-1], "mean": sum(ordered) / len(ordered)}
+
+
+def make_world(enemies=0, platforms=None, seed=0, prefetch=False, swarm=False, scrolling=False):
+    """构造测试用世界：玩家常驻无敌，保证整个场景都在运行游戏逻辑"""
+    world = World(seed, prefetch=prefetch, swarm=swarm, scrolling=scrolling)
+    rng = random.Random(seed)
+    if platforms is not None:
+        world.level = build_tilemap(rng, platforms)
+    if enemies:
+        size = int(16 * CHARACTER_SCALE)
+        world.enemies.clear()
+        world.enemies.capacity = world.spawn_policy.cap = enemies
+        for _ in range(enemies):
+            world.enemies.spawn(rng.randint(0, SCREEN_WIDTH - size), SCREEN_HEIGHT - BLOCK_SIZE - size)
+    world.player.invincible = True
+    world.player.INVINCIBLE_DURATION = float("inf")
+    return world
+
+
+def idle_between_frames(seconds=0.002):
+    """模拟真实游戏中 clock.tick 的帧间空闲，后台线程在这段时间里工作"""
+    time.sleep(seconds)
+
+
+def rebuild_periodically(world, interval=30):
+    """每 interval 帧让分数跨过一次难度阈值，触发关卡切换（帧间保留空闲时间）"""
+    idle_between_frames()
+    if world.tick % interval == 0:
+        world.score = world.difficulty_level * SCORE_TO_INCREASE_DIFFICULTY
+
+
+# 场景名 -> (构造世界, 每帧前的钩子)
+SCENARIOS = {
+    "idle": (lambda: make_world(), None),
+    "goombas_50": (lambda: make_world(enemies=50), None),
+    "goombas_200": (lambda: make_world(enemies=200), None),
+    "goombas_1000": (lambda: make_world(enemies=1000), None),
+    "platforms_40": (lambda: make_world(platforms=40), None),
+    "level_rebuilds": (lambda: make_world(), rebuild_periodically),
+    "level_rebuilds_prefetch": (lambda: make_world(prefetch=True), rebuild_periodically),
+}
+# 使用非默认输入脚本的场景
+SCENARIO_INPUTS = {"scrolling": run_right}
+SCENARIOS["scrolling"] = (lambda: make_world(enemies=50, scrolling=True), None)
+if np is not None:
+    SCENARIOS["swarm_1000"] = (lambda: make_world(enemies=1000, swarm=True), None)
+    SCENARIOS["swarm_5000"] = (lambda: make_world(enemies=5000, swarm=True), None)
+
+
+def check_swarm_parity(count=200, ticks=600, seed=0):
+    """对象池与 EnemySwarm 跑同一场景，逐帧比较敌人状态（与顺序无关），返回不一致的帧数"""
+    pool_world = make_world(enemies=count, seed=seed)
+    swarm_world = make_world(enemies=count, seed=seed, swarm=True)
+    mismatched = 0
+    for tick in range(ticks):
+        inputs = scripted_input(tick)
+        pool_world.step(inputs)
+        swarm_world.step(inputs)
+        if (sorted(pool_world.enemies.state()) != sorted(swarm_world.enemies.state()) or
+                pool_world.score != swarm_world.score):
+            mismatched += 1
+    return {"enemies": count, "ticks": ticks, "mismatched_ticks": mismatched,
+            "enemies_end": len(swarm_world.enemies)}
+
+
+def run_scenario(name, screen, hud, ticks=600):
+    """运行一个场景，返回逻辑帧和渲染耗时分布以及内存分配情况"""
+    factory, hook = SCENARIOS[name]
+    script = SCENARIO_INPUTS.get(name, scripted_input)
+    world = factory()
+    renderer = Renderer(screen)
+    tick_ms = []
+    render_ms = []
+    transition_ms = []  # 发生关卡切换的帧（逻辑 + 渲染）
+    draw_calls = sprites = culled = 0
+    for tick in range(ticks):
+        if hook:
+            hook(world)
+        inputs = script(tick)
+        level = world.level
+        start = time.perf_counter()
+        world.step(inputs)
+        middle = time.perf_counter()
+        draw(world, screen, renderer, hud)
+        renderer.present()
+        end = time.perf_counter()
+        tick_ms.append((middle - start) * 1000)
+        render_ms.append((end - middle) * 1000)
+        draw_calls += renderer.draw_calls
+        sprites += renderer.sprites
+        culled += renderer.culled
+        if world.level is not level:
+            transition_ms.append((end - start) * 1000)
+    world.close()
+
+    # 单独跑一段统计内存分配，避免 tracemalloc 的开销影响上面的计时
+    world = factory()
+    renderer = Renderer(screen)
+    alloc_ticks = min(ticks, 120)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for tick in range(alloc_ticks):
+        if hook:
+            hook(world)
+        world.step(script(tick))
+        draw(world, screen, renderer, hud)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    world.close()
+
+    return {"ticks": ticks, "tick_ms": percentiles(tick_ms), "render_ms": percentiles(render_ms),
+            "transition_ms": percentiles(transition_ms) if transition_ms else None,
+            "alloc_net_bytes": after - before, "alloc_peak_bytes": peak - before,
+            "draw_calls_per_frame": draw_calls / ticks, "sprites_per_frame": sprites / ticks,
+            "culled_per_frame": culled / ticks,
+            "enemies_end": len(world.enemies)}
+
+
+class StallingRenderThread(RenderThread):
+    """每 every 帧在提交前卡顿 stall_ms 毫秒的渲染线程（模拟驱动或合成器偶发的慢帧）"""
+
+    def __init__(self, *args, stall_ms=40, every=15):
+        super().__init__(*args)
+        self.stall_ms = stall_ms
+        self.every = every
+
+    def render(self, snapshot):
+        if self.rendered % self.every == 0:
+            time.sleep(self.stall_ms / 1000)
+        super().render(snapshot)
+
+
+def bench_render_stall(screen, hud, ticks=240, stall_ms=40, every=15):
+    """按真实时间 FPS 运行，渲染周期性卡顿时对比同步绘制与渲染线程的逻辑帧间隔"""
+    frame = 1 / FPS
+    result = {}
+    for mode in ("sync", "render_thread"):
+        world = make_world(enemies=50)
+        renderer = Renderer(screen)
+        thread = None
+        if mode == "render_thread":
+            thread = StallingRenderThread(screen, renderer, hud, stall_ms=stall_ms, every=every)
+            thread.start()
+        intervals = []
+        last = None
+        deadline = time.perf_counter()
+        for tick in range(ticks):
+            start = time.perf_counter()
+            if last is not None:
+                intervals.append((start - last) * 1000)
+            last = start
+            world.step(scripted_input(tick))
+            if thread:
+                thread.publish(capture(world))
+            else:
+                if tick % every == 0:
+                    time.sleep(stall_ms / 1000)
+                draw(world, screen, renderer, hud)
+                renderer.present()
+            # 与 clock.tick 相同：睡到下一帧的时刻，落后时不补帧
+            deadline = max(deadline + frame, time.perf_counter())
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+        world.close()
+        row = {"tick_interval_ms": percentiles(intervals),
+               "late_ticks": sum(1 for ms in intervals if ms > frame * 1000 * 1.5)}
+        if thread:
+            thread.stop()
+            rendered, dropped, (mean, p95, worst) = thread.stats()
+            row.update(rendered=rendered, dropped=dropped,
+                       snapshot_age_ms={"mean": mean, "p95": p95, "max": worst})
+        result[mode] = row
+    return result
+
+
+def bench_pacing(screen, hud, seconds=2.0, render_ms=25):
+    """每帧绘制额外耗时 render_ms 毫秒（超过一帧的预算）时，不追赶（max_skip=0，等同 clock.tick）
+    与跳帧追赶的实际逻辑频率、绘制频率，以及模拟时间与真实时间之比"""
+    result = {}
+    for max_skip in (0, MAX_FRAME_SKIP):
+        world = make_world(enemies=50)
+        renderer = Renderer(screen)
+        pacer = FramePacer(FPS, max_skip)
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for _ in range(pacer.due()):
+                world.step(scripted_input(world.tick))
+            draw(world, screen, renderer, hud)
+            renderer.present()
+            time.sleep(render_ms / 1000)
+            pacer.frame()
+            pacer.wait()
+        elapsed = time.perf_counter() - start
+        world.close()
+        sim_hz, render_hz = pacer.rates()
+        result[f"max_skip_{max_skip}"] = {"sim_hz": sim_hz, "render_hz": render_hz,
+                                          "skipped": pacer.skipped, "dropped": pacer.dropped,
+                                          "game_speed": world.time / 1000 / elapsed}
+    return result
+
+
+def bench_savestate(ticks=600, repeat=1000, seed=0):
+    """存档大小、保存/恢复耗时（微秒）与重新开始的耗时对比，并检查读档后重跑与第一次完全一致"""
+    world = make_world(enemies=50, seed=seed)
+    for tick in range(ticks):
+        world.step(scripted_input(tick))
+    data = savestate.dump(world)
+    for tick in range(ticks, ticks * 2):
+        world.step(scripted_input(tick))
+    expected = world.checksum()
+    savestate.restore(world, data)
+    for tick in range(ticks, ticks * 2):
+        world.step(scripted_input(tick))
+    consistent = world.checksum() == expected
+
+    def timed(action):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            action()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    result = {"bytes": len(data), "consistent": consistent,
+              "dump_us": timed(lambda: savestate.dump(world)),
+              "restore_us": timed(lambda: savestate.restore(world, data)),
+              "restart_us": timed(world.restart)}
+    world.close()
+    return result
+
+
+def bench_startup(repeat=5):
+    """启动时准备精灵资源的耗时（毫秒，取最好一次）：逐个解码 PNG 对比 加载预烘焙图集"""
+    atlas.build()
+    result = {}
+    for name, load in (("decode_png", atlas.load_sources), ("atlas", atlas.load)):
+        best = float("inf")
+        for _ in range(repeat):
+            assets.evict()
+            start = time.perf_counter()
+            load()
+            best = min(best, (time.perf_counter() - start) * 1000)
+        result[name] = best
+    return result
+
+
+def sprite_baseline(cls):
+    """对照组：字段和方法与 cls 相同，但像改用 __slots__ 之前那样继承 pygame.sprite.Sprite、用 __dict__ 存字段"""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in ("__slots__", "__dict__", "__weakref__") and name not in cls.__slots__}
+
+    def __init__(self, *args):
+        pygame.sprite.Sprite.__init__(self)
+        cls.__init__(self, *args)
+
+    namespace["__init__"] = __init__
+    return type(f"Sprite{cls.__name__}", (pygame.sprite.Sprite,), namespace)
+
+
+def _bytes_per_instance(factory, count):
+    """factory(i) 创建的实例平均占用的字节数"""
+    factory(0)
+    gc.collect()
+    tracemalloc.start()
+    entities = [None] * count
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        entities[i] = factory(i)
+    size = (tracemalloc.get_traced_memory()[0] - start) / count
+    tracemalloc.stop()
+    return size
+
+
+def memory_report(count=1000):
+    """每个实体实例平均占用的字节数，{名称: {"sprite": 对照组, "slots": 当前}}
+
+    用 tracemalloc 统计；贴图、动画表等共享资源先预热，不计入。
+    对照组见 sprite_baseline，同一次运行中测出改动前后的数字。
+    """
+    entities = {
+        "Block": (Block, (0, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)),
+        "Enemy": (Enemy, (0, 16, 16)),
+        "Player": (Player, (0, 16, 16)),
+    }
+    report = {}
+    for name, (cls, args) in entities.items():
+        report[name] = {}
+        for variant, factory in (("sprite", sprite_baseline(cls)), ("slots", cls)):
+            report[name][variant] = _bytes_per_instance(lambda i: factory(i % SCREEN_WIDTH, *args), count)
+    return report
+
+
+def git_revision():
+    """当前提交号（不在 git 仓库中时返回 None）"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="踩踩棒性能基准")
+    parser.add_argument("--ticks", type=int, default=600, help="每个场景运行的帧数")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="只运行指定场景（可重复）")
+    parser.add_argument("--output", default="bench_results.json", help="结果 JSON 文件")
+    parser.add_argument("--skip-micro", action="store_true", help="跳过碰撞和关卡重建微基准")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    screen = init_headless()
+    hud = HUD(pygame.font.Font(None, 36))
+    results = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+
+    print(f"{'场景':<24} {'逻辑 p50':>9} {'p95':>7} {'p99':>7} {'渲染 p50':>9} {'p95':>7} {'p99':>7} "
+          f"{'分配KB':>8} {'切换最慢':>8} {'绘制调用':>8} {'图片数':>7}")
+    for name in args.scenario or SCENARIOS:
+        row = run_scenario(name, screen, hud, args.ticks)
+        results["scenarios"][name] = row
+        t, r = row["tick_ms"], row["render_ms"]
+        worst = f"{row['transition_ms']['max']:>8.3f}" if row["transition_ms"] else f"{'-':>8}"
+        print(f"{name:<24} {t['p50']:>9.3f} {t['p95']:>7.3f} {t['p99']:>7.3f} "
+              f"{r['p50']:>9.3f} {r['p95']:>7.3f} {r['p99']:>7.3f} {row['alloc_peak_bytes'] / 1024:>8.1f} {worst}"
+              f" {row['draw_calls_per_frame']:>8.1f} {row['sprites_per_frame']:>7.1f}")
+
+    if not args.skip_micro:
+        results["level_build"] = bench_level_build()
+        print("关卡重建（每瓦片一个 Block 对比 瓦片地图）")
+        for row in results["level_build"]:
+            print(f"  平台数 {row['platforms']:>3}: {row['tile_objects']:>4} 个对象 {row['tile_ms']:.3f} ms"
+                  f" -> {row['span_objects']:>3} 个对象 {row['span_ms']:.3f} ms")
+        if np is not None:
+            results["swarm_parity"] = check_swarm_parity()
+            parity = results["swarm_parity"]
+            print(f"EnemySwarm 与对象池对比: {parity['ticks']} 帧中 {parity['mismatched_ticks']} 帧不一致")
+        results["render_stall"] = bench_render_stall(screen, hud)
+        print("渲染卡顿时的逻辑帧间隔（毫秒）")
+        for mode, row in results["render_stall"].items():
+            t = row["tick_interval_ms"]
+            line = f"  {mode:<14} p50 {t['p50']:6.2f}  p95 {t['p95']:6.2f}  最大 {t['max']:6.2f}  超时帧 {row['late_ticks']:>3}"
+            if "dropped" in row:
+                line += f"  丢帧 {row['dropped']}  快照延迟 p95 {row['snapshot_age_ms']['p95']:.2f} ms"
+            print(line)
+        results["pacing"] = bench_pacing(screen, hud)
+        print("绘制超时（每帧 +25 ms）时的帧节奏")
+        for mode, row in results["pacing"].items():
+            print(f"  {mode:<14} 逻辑 {row['sim_hz']:5.1f} Hz  绘制 {row['render_hz']:5.1f} Hz  "
+                  f"游戏速度 ×{row['game_speed']:.2f}  跳过绘制 {row['skipped']}")
+        results["savestate"] = bench_savestate()
+        state = results["savestate"]
+        print(f"存档: {state['bytes']} 字节，保存 {state['dump_us']:.1f} µs，恢复 {state['restore_us']:.1f} µs"
+              f"（重新开始 {state['restart_us']:.1f} µs），读档后重跑{'一致' if state['consistent'] else '不一致'}")
+        results["startup"] = bench_startup()
+        print(f"启动资源准备: 解码 PNG {results['startup']['decode_png']:.3f} ms"
+              f" -> 图集 {results['startup']['atlas']:.3f} ms")
+        results["entity_bytes"] = memory_report()
+        print("每个实体占用内存（Sprite 子类 -> __slots__）: " +
+              ", ".join(f"{name} {size['sprite']:.0f} -> {size['slots']:.0f} 字节"
+                        for name, size in results["entity_bytes"].items()))
+        results["collision"] = bench_collision()
+        print("地形碰撞耗时（毫秒/帧）")
+        print(f"{'方块数':>6} {'敌人数':>6} {'线性扫描':>10} {'网格索引':>10} {'加速比':>8}  游戏中使用")
+        for row in results["collision"]:
+            print(f"{row['blocks']:>6} {row['enemies']:>6} {row['linear']:>10.3f} {row['grid']:>10.3f} "
+                  f"{row['linear'] / row['grid']:>8.1f}x  {'网格索引' if row['uses_grid'] else '线性扫描'}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,35 @@
 import pygame
 import os
+import assets
 
+IMAGE_PATH = os.path.join('assets', 'Terrain', 'Ground.png')  # 更新路径
 
-class Block(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height):
-        super().__init__()
+
+def tile_image(width, height, tile_size):
+    """用 tile_size 大小的贴图平铺出整段平台的图片"""
+    tile = assets.load_image(IMAGE_PATH, (tile_size, tile_size))
+    image = pygame.Surface((width, height), pygame.SRCALPHA)
+    for x in range(0, width, tile_size):
+        for y in range(0, height, tile_size):
+            image.blit(tile, (x, y))
+    return image
+
+
+class Block:
+    """一段地形：只保存位置和共享贴图的引用"""
+    __slots__ = ("rect", "image")
+
+    def __init__(self, x, y, width, height, tile_size=None):
         self.rect = pygame.Rect(x, y, width, height)
-        self.image_path = os.path.join('assets', 'Terrain', 'Ground.png')  # 更新路径
         try:
-            self.image = pygame.image.load(self.image_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (width, height))
+            # 所有同尺寸方块共享缓存中的同一张贴图
+            if tile_size is None:
+                self.image = assets.load_image(IMAGE_PATH, (width, height))
+            else:
+                self.image = assets.cached(("tiled", IMAGE_PATH, width, height, tile_size),
+                                           lambda: tile_image(width, height, tile_size))
         except FileNotFoundError:
-            print(f"找不到方块图片文件: {self.image_path}")
+            print(f"找不到方块图片文件: {IMAGE_PATH}")
             self.image = pygame.Surface((width, height))
             pygame.draw.rect(self.image, (0, 255, 0), (0, 0, width, height))
             pygame.draw.rect(self.image, (0, 200, 0), (0, 0, width, height), 2)
-
-    def draw(self, screen):
-        """绘制方块到屏幕"""
-        screen.blit(self.image, (self.rect.x, self.rect.y))
\ No newline at end of file
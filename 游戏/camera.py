@@ -0,0 +1,34 @@
+# camera.py
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Camera:
+    """水平跟随玩家的摄像机：只向右滚动，世界坐标减去 x 就是屏幕坐标"""
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, lead=SCREEN_WIDTH // 3):
+        self.x = 0
+        self.width = width
+        self.height = height
+        self.lead = lead  # 玩家越过屏幕左侧这么多像素后开始滚动
+
+    def reset(self):
+        self.x = 0
+
+    def follow(self, rect):
+        """让玩家保持在屏幕左侧 lead 处之前，返回摄像机是否移动"""
+        target = rect.centerx - self.lead
+        if target > self.x:
+            self.x = target
+            return True
+        return False
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    def visible(self, x, width):
+        """左边在世界坐标 x、宽 width 的物体是否有一部分在视野内
+
+        x 也可以是 NumPy 数组，此时逐项判断、返回布尔数组。
+        """
+        return (x + width > self.x) & (x < self.right)
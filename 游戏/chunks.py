@@ -0,0 +1,105 @@
+# chunks.py
+import pygame
+from level import chunk_for
+from camera import Camera
+from spatial import SpatialGrid
+from constants import BLOCK_SIZE, SKY_BLUE, CHUNK_COLS, CHUNKS_AHEAD, CHUNKS_BEHIND
+
+
+def compose(surface, backgrounds, camera_x):
+    """把 (背景图, 世界 x 坐标) 中落在视野内的部分拼到 surface 上"""
+    camera = Camera(*surface.get_size())
+    camera.x = camera_x
+    surface.fill(SKY_BLUE)
+    for background, origin_x in backgrounds:
+        if camera.visible(origin_x, background.get_width()):
+            surface.blit(background, (origin_x - camera_x, 0))
+
+
+class ChunkedLevel:
+    """滚动模式的关卡：世界按固定宽度切成区块，在摄像机前方提前生成，后方卸载
+
+    对外提供与 TileMap 相同的 grid / tiles / view 接口。任何时刻只保留视野附近的几个区块，
+    内存和每帧开销与玩家走了多远无关。
+    """
+
+    def __init__(self, seed, index, difficulty, cols=CHUNK_COLS, ahead=CHUNKS_AHEAD, behind=CHUNKS_BEHIND):
+        self.seed = seed
+        self.index = index
+        self.difficulty = difficulty  # 之后生成的区块使用的难度
+        self.cols = cols
+        self.chunk_width = cols * BLOCK_SIZE
+        self.ahead = ahead
+        self.behind = behind
+        self.chunks = {}  # 区块序号 -> TileMap
+        self.generated = 0
+        self.unloaded = 0
+        self._grid = None
+        self._view = None
+        self._view_x = None
+
+    def update(self, camera):
+        """按摄像机位置生成前方区块、卸载后方区块，返回是否有变化"""
+        width = self.chunk_width
+        first = max(camera.x // width - self.behind, 0)
+        last = (camera.x + camera.width - 1) // width + self.ahead
+        changed = False
+        for chunk in [c for c in self.chunks if c < first or c > last]:
+            del self.chunks[chunk]
+            self.unloaded += 1
+            changed = True
+        for chunk in range(first, last + 1):
+            if chunk not in self.chunks:
+                self.chunks[chunk] = chunk_for(self.seed, self.index, chunk, self.difficulty, self.cols)
+                self.generated += 1
+                changed = True
+        if changed:
+            self._grid = None
+            self._view_x = None
+        return changed
+
+    def set_chunks(self, chunks):
+        """直接替换已加载的区块（读档时使用）"""
+        self.chunks = chunks
+        self._grid = None
+        self._view_x = None
+
+    @property
+    def left(self):
+        """已加载区域左边的世界 x 坐标"""
+        return min(self.chunks) * self.chunk_width
+
+    @property
+    def right(self):
+        """已加载区域右边的世界 x 坐标"""
+        return (max(self.chunks) + 1) * self.chunk_width
+
+    @property
+    def grid(self):
+        """已加载区块全部地形的碰撞索引（区块变化时重建）"""
+        if self._grid is None:
+            self._grid = SpatialGrid(block for chunk in sorted(self.chunks)
+                                     for block in self.chunks[chunk].blocks)
+        return self._grid
+
+    @property
+    def tiles(self):
+        """按区块顺序排列的所有瓦片行（用于校验和）"""
+        return [line for chunk in sorted(self.chunks) for line in self.chunks[chunk].tiles]
+
+    @property
+    def backgrounds(self):
+        """已加载区块的 (背景图, 世界 x 坐标) 元组"""
+        return tuple((self.chunks[chunk].background, self.chunks[chunk].origin_x) for chunk in sorted(self.chunks))
+
+    def view(self, camera):
+        """把视野内的区块背景拼成一屏，返回 (背景, 是否变化)；摄像机不动时直接复用"""
+        if self._view is None:
+            self._view = pygame.Surface((camera.width, camera.height))
+            if pygame.display.get_surface() is not None:
+                self._view = self._view.convert()
+        if camera.x == self._view_x:
+            return self._view, False
+        compose(self._view, self.backgrounds, camera.x)
+        self._view_x = camera.x
+        return self._view, True
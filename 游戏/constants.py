@@ -5,11 +5,24 @@ import pygame
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+MAX_FRAME_SKIP = 5  # 绘制跟不上时最多连续跳过的绘制次数（之后放弃追赶）
 SKY_BLUE = (135, 206, 235)
 BLOCK_SIZE = 32
 CHARACTER_SCALE = 3
+DIRTY_RECT_RENDERING = False  # 脏矩形渲染（只提交变化区域，适合软件渲染）
+CHUNK_COLS = 25  # 滚动模式下每个地形区块的列数（25 列 = 一屏宽）
+CHUNKS_AHEAD = 1  # 视野右侧提前生成的区块数
+CHUNKS_BEHIND = 1  # 视野左侧保留的区块数，更远的区块卸载
 
 # 物理常量
 GRAVITY = 0.75
 PLAYER_SPEED = 5  # 玩家移动速度
-JUMP_POWER = -15  # 跳跃力量
\ No newline at end of file
+JUMP_POWER = -15  # 跳跃力量
+
+# 游戏规则
+SCORE_TO_INCREASE_DIFFICULTY = 10  # 每多少分提升一级难度
+MAX_HEALTH = 5  # 最大生命值限制
+ENEMY_SPAWN_DELAY = 5000  # 敌人生成间隔（毫秒）
+MAX_ENEMIES = 64  # 同屏敌人数量上限
+HEALTH_ADD_DURATION = 2000  # 生命加成提示显示时间（毫秒）
+HEALTH_ADD_PROBABILITY = 0.1  # 杀怪加血概率（10%）
@@ -0,0 +1,44 @@
+# contact.py
+from collections import namedtuple
+
+STOMPED = "stomped"            # 踩扁了一个敌人（enemy 为容器给出的敌人标识）
+DAMAGED = "damaged"            # 玩家侧面碰到敌人并受伤
+HEALTH_BONUS = "health_bonus"  # 踩敌人时随机加命
+
+STOMP_BOUNCE = -5  # 踩中后玩家的反弹速度
+SIDE_MARGIN = 10   # 玩家脚底低于敌人顶部这么多像素才算侧面碰撞
+
+ContactEvent = namedtuple("ContactEvent", "kind enemy")
+
+
+def resolve_contacts(player, candidates, now, rng, max_health, bonus_probability):
+    """玩家与附近敌人的接触判定，每个候选敌人只判定一次，返回事件列表
+
+    candidates 是粗筛得到的 (x, y, 宽, 高, 敌人标识)，需按位置排好序，
+    这样结果与敌人在容器中的存放顺序无关。
+    踩踏优先于侧面碰撞；反弹和加命直接作用在玩家身上，
+    侧面碰撞在所有踩踏之后统一结算，同一帧最多受伤一次。
+    """
+    events = []
+    rect = player.rect
+    touching = False
+    for x, y, width, height, enemy in candidates:
+        if rect.right <= x or rect.left >= x + width:
+            continue
+        # 从上方踩下：敌人立即消失，玩家小幅反弹
+        if rect.bottom < y + height // 2 and rect.bottom + player.velocity_y >= y:
+            player.velocity_y = STOMP_BOUNCE
+            events.append(ContactEvent(STOMPED, enemy))
+            if rng.random() < bonus_probability and player.health < max_health:
+                player.health += 1
+                events.append(ContactEvent(HEALTH_BONUS, None))
+        elif rect.bottom > y + SIDE_MARGIN and rect.top < y + height:
+            touching = True
+    # 受伤后立即无敌，同一帧多次碰撞只算一次；无敌时 hit 不扣血，也就没有事件。
+    # hit 只在致死时返回 True，这里按生命值判断是否真的受了伤，是否结束由 World 决定
+    if touching:
+        health = player.health
+        player.hit(now)
+        if player.health < health:
+            events.append(ContactEvent(DAMAGED, None))
+    return events
@@ -0,0 +1,159 @@
+# enemy_pool.py
+import struct
+from enemy import Enemy
+from animation import LEFT
+from constants import BLOCK_SIZE, CHARACTER_SCALE, ENEMY_SPAWN_DELAY, GRAVITY, MAX_ENEMIES
+
+
+class SpawnPolicy:
+    """定时生成敌人的策略：每隔 delay 毫秒生成 batch 个，活跃数量不超过 cap"""
+
+    def __init__(self, delay=ENEMY_SPAWN_DELAY, cap=MAX_ENEMIES, batch=1):
+        self.delay = delay
+        self.cap = cap
+        self.batch = batch
+
+    def due(self, now, last_spawn):
+        """距离上次生成是否已经超过间隔"""
+        return now - last_spawn > self.delay
+
+    def count(self, active):
+        """本次应生成的数量"""
+        return max(0, min(self.batch, self.cap - active))
+
+
+# 存档中每个敌人的二进制记录：x, y, 垂直速度, 方向, 朝向, 动画帧, 连续撞墙次数, 是否着地
+STATE_RECORD = struct.Struct("<iidbbhh?")
+
+
+def _position(enemy):
+    """接触检测的判定顺序：按位置（及其余可见状态）排序，与存放顺序无关"""
+    return (enemy.rect.x, enemy.rect.y, enemy.velocity_y, enemy.direction == LEFT)
+
+
+class EnemyPool:
+    """敌人对象池：复用 Enemy 实例，生成时原地重置状态，删除时与末尾交换，均为 O(1)"""
+
+    def __init__(self, capacity=MAX_ENEMIES, width=16, height=16, cell_size=BLOCK_SIZE, gravity=GRAVITY):
+        self.capacity = capacity
+        self.cell_size = cell_size
+        self.width = width
+        self.height = height
+        self.gravity = gravity
+        self.active = []  # 活跃敌人（顺序不固定）
+        self.free = []    # 回收的敌人
+        self.created = 0  # 实际创建过的 Enemy 数量
+        self.columns = {}  # 列号 -> 该列中的敌人，每次 update 重建
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def __len__(self):
+        return len(self.active)
+
+    def __getitem__(self, index):
+        return self.active[index]
+
+    def spawn(self, x, y):
+        """在 (x, y) 生成一个敌人；已达上限时返回 None"""
+        if len(self.active) >= self.capacity:
+            return None
+        if self.free:
+            enemy = self.free.pop()
+            enemy.reset(x, y)
+        else:
+            enemy = Enemy(x, y, self.width, self.height, self.gravity)
+            self.created += 1
+        enemy.pool_index = len(self.active)
+        self.active.append(enemy)
+        return enemy
+
+    def despawn(self, enemy):
+        """回收敌人：末尾的敌人移到它的位置"""
+        index = enemy.pool_index
+        last = self.active.pop()
+        if last is not enemy:
+            self.active[index] = last
+            last.pool_index = index
+        enemy.pool_index = -1
+        self.free.append(enemy)
+
+    def clear(self):
+        """回收全部敌人"""
+        for enemy in self.active:
+            enemy.pool_index = -1
+        self.free.extend(self.active)
+        self.active.clear()
+        self.columns = {}
+
+    def update(self, blocks, screen_width, left=0):
+        """移动所有敌人（活动范围 left 到 screen_width），顺便按 x 坐标分列，供接触检测粗筛"""
+        cell = self.cell_size
+        columns = self.columns = {}
+        for enemy in self.active:
+            enemy.move(blocks, screen_width, left)
+            column = enemy.rect.x // cell
+            bucket = columns.get(column)
+            if bucket is None:
+                columns[column] = [enemy]
+            else:
+                bucket.append(enemy)
+
+    def near(self, rect):
+        """粗筛：x 方向可能与 rect 重叠的敌人，按位置排序，返回 (x, y, 宽, 高, 敌人)"""
+        cell = self.cell_size
+        columns = self.columns
+        found = []
+        for column in range((rect.left - self.width * CHARACTER_SCALE) // cell, (rect.right - 1) // cell + 1):
+            bucket = columns.get(column)
+            if bucket:
+                found.extend(bucket)
+        found.sort(key=_position)
+        return [(*enemy.rect, enemy) for enemy in found]
+
+    def remove(self, enemies):
+        """回收一批敌人"""
+        for enemy in enemies:
+            self.despawn(enemy)
+
+    def cull(self, left, right):
+        """回收完全离开 left 到 right 范围的敌人（滚动模式下区块卸载时调用），返回回收数量"""
+        gone = [enemy for enemy in self.active if enemy.rect.right <= left or enemy.rect.left >= right]
+        self.remove(gone)
+        return len(gone)
+
+    def sprites(self, camera=None):
+        """视野内敌人的 (图片, 屏幕坐标) 列表"""
+        if camera is None:
+            return [(enemy.walk[enemy.facing].frame(enemy.animation_frame), enemy.rect.topleft)
+                    for enemy in self.active]
+        left = camera.x
+        return [(enemy.walk[enemy.facing].frame(enemy.animation_frame), (enemy.rect.x - left, enemy.rect.y))
+                for enemy in self.active if camera.visible(enemy.rect.x, enemy.rect.width)]
+
+    def draw(self, renderer, camera=None):
+        """把视野内的敌人提交到渲染队列"""
+        renderer.submit_many(self.sprites(camera))
+
+    def state(self):
+        """每个敌人的 (x, y, 宽, 高, 垂直速度, 是否朝左)，用于校验和快照"""
+        return [(*enemy.rect, enemy.velocity_y, enemy.direction == LEFT) for enemy in self.active]
+
+    def pack_state(self):
+        """全部活跃敌人编码为 STATE_RECORD 记录（按存放顺序）"""
+        pack = STATE_RECORD.pack
+        return b"".join(pack(enemy.rect.x, enemy.rect.y, enemy.velocity_y, enemy.direction, enemy.facing,
+                             enemy.animation_frame, enemy.consecutive_collisions, enemy.on_ground)
+                        for enemy in self.active)
+
+    def unpack_state(self, data):
+        """按 pack_state 的结果恢复敌人（复用回收的实例，不重新加载图片）"""
+        self.clear()
+        for x, y, velocity_y, direction, facing, frame, collisions, on_ground in STATE_RECORD.iter_unpack(data):
+            enemy = self.spawn(x, y)
+            enemy.velocity_y = velocity_y
+            enemy.direction = direction
+            enemy.facing = facing
+            enemy.animation_frame = frame
+            enemy.consecutive_collisions = collisions
+            enemy.on_ground = on_ground
@@ -0,0 +1,409 @@
+# env.py
+import os
+import sys
+import time
+import heapq
+import argparse
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
+
+# 无窗口运行（需在导入 pygame 之前设置）
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from world import World
+from replay import decode_input, LEFT, RIGHT, JUMP
+from swarm import np
+from constants import FPS
+
+# 向量化环境：N 个无窗口的游戏实例一起 reset/step，观测、奖励、结束标志按批返回。
+# 实例分散到若干个工作进程中，批量数据放在共享内存里，每步只通过管道传一条很短的命令。
+
+# 可扫描的参数：constants.py 中的名称 -> World 的关键字参数
+PARAMS = {"GRAVITY": "gravity", "JUMP_POWER": "jump_power", "ENEMY_SPAWN_DELAY": "spawn_delay"}
+
+# 动作为一个字节，与录像文件的按键位相同（重新开始键无效，结束的一局会自动重开）
+NUM_ACTIONS = (LEFT | RIGHT | JUMP) + 1
+
+NEAREST_ENEMIES = 4  # 观测中包含的最近敌人数量
+PLAYER_FEATURES = 10
+OBS_SIZE = PLAYER_FEATURES + 3 * NEAREST_ENEMIES
+MAX_EPISODE_TICKS = 60 * FPS  # 每局最多一分钟（模拟时间）
+
+
+def _layout(num_envs):
+    """共享内存中各数组的 (名称, 类型, 形状)"""
+    return [
+        ("obs", "float32", (num_envs, OBS_SIZE)),
+        ("rewards", "float32", (num_envs,)),
+        ("dones", "bool", (num_envs,)),
+        ("actions", "uint8", (num_envs,)),
+        ("episode_scores", "int32", (num_envs,)),  # 最近一局结束时的分数
+        ("episode_ticks", "int32", (num_envs,)),   # 最近一局的帧数
+        ("running_scores", "int32", (num_envs,)),  # 正在进行的一局当前的分数
+        ("running_ticks", "int32", (num_envs,)),   # 正在进行的一局当前的帧数
+    ]
+
+
+def _buffer_size(num_envs):
+    return sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in _layout(num_envs))
+
+
+def _views(buffer, num_envs):
+    """在一块内存上按布局切出各个数组"""
+    views = {}
+    offset = 0
+    for name, dtype, shape in _layout(num_envs):
+        array = np.ndarray(shape, dtype, buffer, offset)
+        views[name] = array
+        offset += array.nbytes
+    return views
+
+
+def observe(world, out):
+    """把世界状态写入长度为 OBS_SIZE 的数组：玩家状态 + 最近几个敌人的相对位置"""
+    player = world.player
+    rect = player.rect
+    out[:PLAYER_FEATURES] = (rect.x - world.camera.x, rect.y, player.velocity_x, player.velocity_y,
+                             player.on_ground, player.health, world.score, world.difficulty_level,
+                             player.invincible, len(world.enemies))
+    px, py = rect.center
+    states = world.enemies.state()
+    nearest = heapq.nsmallest(NEAREST_ENEMIES, states,
+                              key=lambda s: (s[0] + s[2] // 2 - px) ** 2 + (s[1] + s[3] // 2 - py) ** 2)
+    features = out[PLAYER_FEATURES:].reshape(NEAREST_ENEMIES, 3)
+    features[:] = 0
+    for row, (x, y, w, h, _, facing_left) in zip(features, nearest):
+        # 第三项为朝向（-1 左，1 右），0 表示没有敌人
+        row[:] = (x + w // 2 - px, y + h // 2 - py, -1 if facing_left else 1)
+
+
+class _Batch:
+    """一组游戏实例，读写共享数组中属于自己的那一段（工作进程和单进程模式共用）"""
+
+    def __init__(self, views, start, stop, params, options):
+        self.views = views
+        self.start = start
+        self.stop = stop
+        self.params = params[start:stop]
+        self.options = options
+        self.worlds = []
+
+    def _world(self, seed, params):
+        return World(seed, **self.options, **{PARAMS[name]: value for name, value in params.items()})
+
+    def reset(self, seeds):
+        self.worlds = [self._world(seed, params) for seed, params in zip(seeds, self.params)]
+        v = self.views
+        for i, world in enumerate(self.worlds, self.start):
+            observe(world, v["obs"][i])
+        v["rewards"][self.start:self.stop] = 0
+        v["dones"][self.start:self.stop] = False
+        v["running_scores"][self.start:self.stop] = 0
+        v["running_ticks"][self.start:self.stop] = 0
+
+    def step(self):
+        v = self.views
+        obs, rewards, dones = v["obs"], v["rewards"], v["dones"]
+        actions = v["actions"]
+        for i, world in enumerate(self.worlds, self.start):
+            j = i - self.start
+            player = world.player
+            score, health = world.score, player.health
+            world.step(decode_input(actions[i]))
+            # 奖励：得分增加为正，掉血为负，加命为正
+            rewards[i] = (world.score - score) + (player.health - health)
+            done = world.game_over or world.tick >= MAX_EPISODE_TICKS
+            dones[i] = done
+            if done:
+                v["episode_scores"][i] = world.score
+                v["episode_ticks"][i] = world.tick
+                # 自动开始新的一局；新种子取自旧世界的随机数，整个批次仍然可复现
+                world.close()
+                world = self.worlds[j] = self._world(world.rng.randrange(2 ** 32), self.params[j])
+            observe(world, obs[i])
+            v["running_scores"][i] = world.score
+            v["running_ticks"][i] = world.tick
+
+    def close(self):
+        for world in self.worlds:
+            world.close()
+
+
+def _worker(conn, name, num_envs, start, stop, params, options):
+    """工作进程：挂接共享内存，按主进程的命令推进自己负责的实例"""
+    memory = shared_memory.SharedMemory(name=name)
+    batch = _Batch(_views(memory.buf, num_envs), start, stop, params, options)
+    try:
+        while True:
+            command, argument = conn.recv()
+            if command == "step":
+                batch.step()
+            elif command == "reset":
+                batch.reset(argument)
+            else:
+                break
+            conn.send(None)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        batch.close()
+        batch.views = None  # 释放对共享内存的引用后才能关闭
+        memory.close()
+
+
+class VectorEnv:
+    """多实例游戏环境
+
+    reset(seeds) 返回观测 (N, OBS_SIZE)；step(actions) 返回 (观测, 奖励, 结束标志)。
+    结束的实例会自动开始新的一局，返回的观测属于新的一局，
+    结束那一局的分数和帧数见 episode_scores / episode_ticks，正在进行的一局见 running_scores / running_ticks。
+    workers=0 时在当前进程内运行（便于调试，也是多进程的对照组）。
+    params 为参数字典（所有实例相同）或每个实例一个字典的列表，键见 PARAMS。
+    """
+
+    def __init__(self, num_envs, workers=None, params=None, **options):
+        if np is None:
+            raise ImportError("VectorEnv 需要安装 numpy")
+        if params is None or isinstance(params, dict):
+            params = [params or {}] * num_envs
+        if len(params) != num_envs:
+            raise ValueError(f"params 数量 ({len(params)}) 与实例数 ({num_envs}) 不一致")
+        for name in set(itertools.chain.from_iterable(params)):
+            if name not in PARAMS:
+                raise ValueError(f"未知参数: {name}（可用: {', '.join(PARAMS)}）")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, num_envs)
+        self.num_envs = num_envs
+        self.workers = workers
+
+        self.memory = None
+        self.processes = []
+        self.connections = []
+        if workers == 0:
+            self.views = _views(bytearray(_buffer_size(num_envs)), num_envs)
+            self.batches = [_Batch(self.views, 0, num_envs, params, options)]
+            return
+
+        self.memory = shared_memory.SharedMemory(create=True, size=_buffer_size(num_envs))
+        self.views = _views(self.memory.buf, num_envs)
+        self.batches = []
+        bounds = [num_envs * k // workers for k in range(workers + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, daemon=True,
+                                              args=(child, self.memory.name, num_envs, start, stop, params, options))
+            process.start()
+            child.close()
+            self.processes.append((process, start, stop))
+            self.connections.append(parent)
+
+    def _run(self, command, arguments):
+        """向所有工作进程发命令并等待全部完成"""
+        for connection, argument in zip(self.connections, arguments):
+            connection.send((command, argument))
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seeds):
+        """用给定种子（每个实例一个）开始新的一局，返回观测"""
+        seeds = list(seeds)
+        if len(seeds) != self.num_envs:
+            raise ValueError(f"种子数量 ({len(seeds)}) 与实例数 ({self.num_envs}) 不一致")
+        if self.processes:
+            self._run("reset", [seeds[start:stop] for _, start, stop in self.processes])
+        else:
+            self.batches[0].reset(seeds)
+        return self.views["obs"].copy()
+
+    def step(self, actions):
+        """所有实例各推进一帧，返回 (观测, 奖励, 结束标志)"""
+        self.views["actions"][:] = actions
+        if self.processes:
+            self._run("step", [None] * len(self.processes))
+        else:
+            self.batches[0].step()
+        v = self.views
+        return v["obs"].copy(), v["rewards"].copy(), v["dones"].copy()
+
+    @property
+    def episode_scores(self):
+        return self.views["episode_scores"].copy()
+
+    @property
+    def episode_ticks(self):
+        return self.views["episode_ticks"].copy()
+
+    @property
+    def running_scores(self):
+        return self.views["running_scores"].copy()
+
+    @property
+    def running_ticks(self):
+        return self.views["running_ticks"].copy()
+
+    def close(self):
+        """结束工作进程并释放共享内存"""
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except OSError:
+                pass
+        for process, _, _ in self.processes:
+            process.join(timeout=5)
+        for connection in self.connections:
+            connection.close()
+        self.processes = []
+        self.connections = []
+        for batch in self.batches:
+            batch.close()
+        self.views = None
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def random_actions(rng, count):
+    """随机策略：大多数时候向右跑，偶尔向左，经常跳"""
+    moves = rng.choice(np.array([RIGHT, RIGHT, LEFT, 0], np.uint8), count)
+    jumps = np.where(rng.random(count) < 0.2, JUMP, 0).astype(np.uint8)
+    return moves | jumps
+
+
+def run(env, steps, seed=0):
+    """用随机策略推进 steps 帧，返回 (每秒总步数, 每个实例结束的局列表 [(分数, 帧数)],
+    每个实例到最后还没结束的那一局 (分数, 帧数))"""
+    rng = np.random.default_rng(seed)
+    env.reset(range(seed, seed + env.num_envs))
+    finished = [[] for _ in range(env.num_envs)]
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, dones = env.step(random_actions(rng, env.num_envs))
+        if dones.any():
+            scores, ticks = env.episode_scores, env.episode_ticks
+            for i in np.nonzero(dones)[0]:
+                finished[i].append((int(scores[i]), int(ticks[i])))
+    elapsed = time.perf_counter() - start
+    truncated = list(zip(env.running_scores.tolist(), env.running_ticks.tolist()))
+    return env.num_envs * steps / elapsed, finished, truncated
+
+
+def bench_scaling(num_envs=32, steps=500, worker_counts=None, **options):
+    """不同工作进程数下的总吞吐量（0 表示单进程）"""
+    if worker_counts is None:
+        # 单进程对照，然后 1、2、4…… 个进程直到核心数
+        cores = os.cpu_count() or 1
+        worker_counts = [0] + [2 ** k for k in range(cores.bit_length()) if 2 ** k < cores] + [cores]
+    results = []
+    for workers in worker_counts:
+        with VectorEnv(num_envs, workers, **options) as env:
+            rate, _, _ = run(env, steps)
+        results.append({"workers": workers, "steps_per_sec": round(rate)})
+    return results
+
+
+def parse_sweep(specs):
+    """把 ["GRAVITY=0.6,0.75", "JUMP_POWER=-13,-15"] 展开成参数字典的列表（笛卡尔积）"""
+    names, values = [], []
+    for spec in specs:
+        name, _, text = spec.partition("=")
+        if name not in PARAMS or not text:
+            raise ValueError(f"无法解析扫描参数: {spec}（格式 名称=值1,值2，名称可用: {', '.join(PARAMS)}）")
+        names.append(name)
+        values.append([float(v) if "." in v else int(v) for v in text.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _means(episodes):
+    """[(分数, 帧数)] 的 (平均分数, 平均秒数)；为空时为 (None, None)"""
+    if not episodes:
+        return None, None
+    return (sum(s for s, _ in episodes) / len(episodes),
+            sum(t for _, t in episodes) / len(episodes) / FPS)
+
+
+def sweep(grid, repeats=8, steps=MAX_EPISODE_TICKS, workers=None, **options):
+    """对每组参数运行 repeats 个实例，返回每组结束的局和到最后还没结束的局各自的平均分数、平均局长
+
+    只统计结束的局会偏向死得早的玩家，所以没结束的局（按结束运行时的分数和帧数）单独列出。
+    steps 不小于 MAX_EPISODE_TICKS 时每个实例至少结束一局。
+    """
+    params = [combo for combo in grid for _ in range(repeats)]
+    with VectorEnv(len(params), workers, params, **options) as env:
+        _, finished, truncated = run(env, steps)
+    results = []
+    for k, combo in enumerate(grid):
+        episodes = [e for runs in finished[k * repeats:(k + 1) * repeats] for e in runs]
+        running = [e for e in truncated[k * repeats:(k + 1) * repeats] if e[1] > 0]
+        mean_score, mean_seconds = _means(episodes)
+        truncated_score, truncated_seconds = _means(running)
+        results.append({
+            "params": combo,
+            "episodes": len(episodes),
+            "mean_score": mean_score,
+            "mean_seconds": mean_seconds,
+            "truncated": len(running),
+            "truncated_score": truncated_score,
+            "truncated_seconds": truncated_seconds,
+        })
+    return results
+
+
+def _summary(count, score, seconds):
+    """局数、平均分数、平均时长；没有局时显示 n/a，与真的得 0 分区分开"""
+    if not count:
+        return f"{0:>4} 局 平均分数    n/a 平均时长    n/a "
+    return f"{count:>4} 局 平均分数 {score:6.2f} 平均时长 {seconds:6.1f}s"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="多进程无窗口运行游戏：吞吐量测试与参数扫描")
+    parser.add_argument("--envs", type=int, default=32, help="实例数量")
+    parser.add_argument("--steps", type=int, default=MAX_EPISODE_TICKS,
+                        help="每个实例推进的帧数（默认为一局的上限，每个实例至少结束一局）")
+    parser.add_argument("--workers", type=int, nargs="*", help="要测试的工作进程数（0 为单进程）")
+    parser.add_argument("--swarm", action="store_true", help="使用 NumPy 批量敌人系统")
+    parser.add_argument("--scroll", action="store_true", help="滚动模式")
+    parser.add_argument("--sweep", nargs="+", metavar="名称=值1,值2", help="参数扫描，例如 GRAVITY=0.6,0.75,0.9")
+    parser.add_argument("--repeats", type=int, default=8, help="参数扫描时每组参数的实例数")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if np is None:
+        print("需要安装 numpy")
+        return 1
+    options = {"swarm": args.swarm, "scrolling": args.scroll}
+    print(f"CPU 核心数: {os.cpu_count()}")
+
+    if args.sweep:
+        grid = parse_sweep(args.sweep)
+        workers = args.workers[0] if args.workers else None
+        print(f"参数扫描: {len(grid)} 组 × {args.repeats} 个实例，每个 {args.steps} 帧")
+        for result in sweep(grid, args.repeats, args.steps, workers, **options):
+            params = " ".join(f"{name}={value}" for name, value in result["params"].items())
+            print(f"  {params:<40} 结束 {_summary(result['episodes'], result['mean_score'], result['mean_seconds'])}"
+                  f"  未结束 {_summary(result['truncated'], result['truncated_score'], result['truncated_seconds'])}")
+        return 0
+
+    print(f"吞吐量: {args.envs} 个实例，每个 {args.steps} 帧")
+    results = bench_scaling(args.envs, args.steps, args.workers, **options)
+    base = results[0]["steps_per_sec"]
+    for result in results:
+        label = "单进程" if result["workers"] == 0 else f"{result['workers']} 个进程"
+        print(f"  {label:<8} {result['steps_per_sec']:>9} 步/秒  ×{result['steps_per_sec'] / base:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# fonts.py
+import os
+import json
+import pygame
+
+# 候选中文字体（按优先级），前几个与原来的 SysFont 列表一致
+FONT_NAMES = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC", "Microsoft YaHei",
+              "Noto Sans CJK SC", "Source Han Sans SC", "WenQuanYi Zen Hei", "Droid Sans Fallback"]
+# 界面上会出现的汉字，找到的字体必须都能显示
+REQUIRED_TEXT = "分数生命难度游戏结束按键重新开始"
+
+CACHE_PATH = os.path.join("assets", ".cache", "font.json")
+
+
+def _missing_glyph(font):
+    """字体中不存在的字符渲染出来的样子（通常是方框）"""
+    return pygame.image.tobytes(font.render("￿", False, (255, 255, 255)), "RGBA")
+
+
+def has_glyphs(path, text=REQUIRED_TEXT):
+    """字体文件能否显示 text 中的全部字符（与缺字方框比较渲染结果）"""
+    try:
+        font = pygame.font.Font(path, 24)
+    except (OSError, pygame.error):
+        return False
+    missing = _missing_glyph(font)
+    return all(pygame.image.tobytes(font.render(ch, False, (255, 255, 255)), "RGBA") != missing
+               for ch in set(text))
+
+
+def find_font_path():
+    """在系统字体中查找能显示界面文字的字体文件（会触发一次系统字体扫描，较慢）"""
+    for name in FONT_NAMES:
+        path = pygame.font.match_font(name)
+        if path and has_glyphs(path):
+            return path
+    return None
+
+
+def _cache_key():
+    return {"names": FONT_NAMES, "text": REQUIRED_TEXT}
+
+
+def _read_cache():
+    """读取上次找到的字体；文件变化或候选列表变化时返回 None"""
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("key") != _cache_key():
+        return None
+    path = cache.get("path")
+    if path is None:
+        return None  # 旧版本缓存的“找不到字体”，重新查找
+    try:
+        if os.stat(path).st_mtime_ns != cache.get("mtime"):
+            return None
+    except OSError:
+        return None
+    return cache
+
+
+def _write_cache(path):
+    cache = {"key": _cache_key(), "path": path, "mtime": os.stat(path).st_mtime_ns}
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"警告: 无法写入字体缓存: {e}")
+
+
+def resolve_font_path():
+    """中文字体文件路径（没有时为 None）；找到的字体缓存在磁盘上，之后启动不再扫描系统字体
+
+    找不到时不缓存，之后安装的中文字体在下次启动时就能用上。
+    """
+    cache = _read_cache()
+    if cache is not None:
+        return cache["path"]
+    path = find_font_path()
+    if path:
+        _write_cache(path)
+    return path
+
+
+def load_font(size):
+    """按缓存的字体文件直接打开字体；没有中文字体时使用默认字体"""
+    path = resolve_font_path()
+    if path:
+        print(f"使用字体文件: {path}")
+    else:
+        print("警告：未找到中文字体，使用默认字体")
+    return pygame.font.Font(path, size)
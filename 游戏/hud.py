@@ -0,0 +1,91 @@
+# hud.py
+from collections import OrderedDict
+from render import LAYER_HUD
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+
+class TextCache:
+    """按 (文字, 颜色) 缓存 font.render 结果的小型 LRU，只有文字变化时才重新光栅化"""
+
+    def __init__(self, font, capacity=64):
+        self.font = font
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.misses = 0
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = self.font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+class DigitAtlas:
+    """预先渲染 0-9，整数由数字图片拼接，分数变化时不再光栅化任何字形"""
+
+    def __init__(self, font, color):
+        self.digits = [font.render(str(d), True, color) for d in range(10)]
+        self.minus = font.render("-", True, color)
+
+    def draw(self, renderer, value, pos):
+        """在 pos 处绘制整数"""
+        x, y = pos
+        if value < 0:
+            renderer.submit(self.minus, (x, y), LAYER_HUD)
+            x += self.minus.get_width()
+        for ch in str(abs(value)):
+            digit = self.digits[ord(ch) - 48]
+            renderer.submit(digit, (x, y), LAYER_HUD)
+            x += digit.get_width()
+
+
+class HUD:
+    """分数、生命、难度等界面文字"""
+
+    def __init__(self, font, use_digit_atlas=True):
+        self.text = TextCache(font)
+        self.digits = DigitAtlas(font, WHITE) if use_digit_atlas else None
+
+    def draw_value(self, renderer, label, value, pos):
+        """绘制“标签: 数值”一行"""
+        if self.digits is None:
+            renderer.submit(self.text.render(f"{label}: {value}", WHITE), pos, LAYER_HUD)
+            return
+        label_surface = self.text.render(f"{label}: ", WHITE)
+        renderer.submit(label_surface, pos, LAYER_HUD)
+        self.digits.draw(renderer, value, (pos[0] + label_surface.get_width(), pos[1]))
+
+    def draw(self, world, renderer):
+        """绘制一帧的界面文字"""
+        self.draw_state(renderer, world.score, world.player.health, world.difficulty_level,
+                        world.health_added, world.game_over)
+
+    def draw_state(self, renderer, score, health, difficulty_level, health_added, game_over):
+        """按给定数值绘制界面文字（渲染线程从快照绘制时使用）"""
+        # 绘制分数、血量和难度
+        self.draw_value(renderer, "分数", score, (10, 10))
+        self.draw_value(renderer, "生命", health, (10, 50))
+        self.draw_value(renderer, "难度", difficulty_level, (10, 90))
+
+        # 绘制生命加成提示
+        if health_added:
+            renderer.submit(self.text.render("+1 生命!", GREEN), (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 100),
+                            LAYER_HUD)
+
+        # 游戏结束显示（整屏刷新）
+        if game_over:
+            renderer.invalidate()
+            renderer.submit(self.text.render("游戏结束", RED), (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50), LAYER_HUD)
+            renderer.submit(self.text.render("按 R 键重新开始", WHITE), (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2),
+                            LAYER_HUD)
@@ -0,0 +1,229 @@
+# level.py
+import random
+from tilemap import TileMap, GROUND
+from constants import SCREEN_HEIGHT, BLOCK_SIZE, GRAVITY, JUMP_POWER, PLAYER_SPEED, CHUNK_COLS, CHARACTER_SCALE
+
+NUM_PLATFORMS = 5  # 每关平台数量
+MAX_ATTEMPTS = 12  # 每个平台随机尝试的次数上限
+PLAYER_WIDTH_COLS = 2  # 玩家宽度（48 像素）向上取整占的列数
+PLAYER_HEIGHT = 16 * CHARACTER_SCALE
+PLAYER_HEIGHT_ROWS = -(-PLAYER_HEIGHT // BLOCK_SIZE)  # 玩家高度向上取整占的行数
+
+
+def jump_reach(rise):
+    """从站立面起跳、落到高 rise 像素的平台上时，水平方向最远能移动多少像素；够不着返回 -1
+
+    与 Player.move 的顺序一致：先设定起跳速度，每帧先加重力再移动。
+    """
+    velocity = JUMP_POWER
+    y = 0
+    frames = 0
+    apex = 0
+    while True:
+        velocity += GRAVITY
+        y += velocity
+        frames += 1
+        apex = min(apex, y)
+        if velocity > 0 and y >= -rise:
+            break
+    if -apex < rise:
+        return -1
+    return frames * PLAYER_SPEED
+
+
+def jump_height():
+    """起跳后脚底最多能上升的像素"""
+    velocity = JUMP_POWER
+    y = 0
+    while velocity + GRAVITY < 0:
+        velocity += GRAVITY
+        y += velocity
+    return int(-y)
+
+
+def _reach_table():
+    """按上升行数预先算好水平可达列数（下标为上升的行数）"""
+    table = [0]
+    rows = 1
+    while True:
+        reach = jump_reach(rows * BLOCK_SIZE)
+        if reach < 0:
+            return table
+        table.append(reach // BLOCK_SIZE)
+        rows += 1
+
+
+# REACH_COLS[n]：向上 n 行的平台最多可以离站立面多少列；len(REACH_COLS) - 1 为最多能上升的行数
+REACH_COLS = _reach_table()
+MAX_RISE_ROWS = len(REACH_COLS) - 1
+# 整个跳跃过程中玩家身体扫过的高度（站立面以上的行数）
+JUMP_CLEAR_ROWS = -(-(jump_height() + PLAYER_HEIGHT) // BLOCK_SIZE)
+
+
+def _is_empty(tilemap, box):
+    """矩形区域 (首行, 末行, 首列, 末列)（末行、末列不含）内没有任何瓦片"""
+    top, bottom, left, right = box
+    return not any(any(tilemap.tiles[r][left:right]) for r in range(top, bottom))
+
+
+def jump_corridor(tilemap, anchor, row, col, length):
+    """从站立面 anchor=(行, 起始列, 结束列) 跳上平台 (row, col, length) 要经过的矩形区域；跳不上去返回 None
+
+    玩家站在平台左侧或右侧、与站立面重叠的 PLAYER_WIDTH_COLS 列起跳（平台正下方会顶头），
+    落在平台靠近起跳一侧的边缘。区域从站立面往上 JUMP_CLEAR_ROWS 行，横跨起跳位置到落点，
+    其中没有瓦片时整条跳跃弧线都不会被挡住，落点上方也站得下玩家。
+    """
+    anchor_row, start, end = anchor
+    rise = anchor_row - row
+    if not 1 <= rise <= MAX_RISE_ROWS:
+        return None
+    width = PLAYER_WIDTH_COLS
+    landing = min(length, width)
+    top = max(anchor_row - JUMP_CLEAR_ROWS, 0)
+    # 左侧起跳：起跳位置尽量靠近平台，且至少有一列踩在站立面上
+    takeoff = min(col - width, end - 1)
+    if takeoff >= max(start - 1, 0) and col - (takeoff + width) <= REACH_COLS[rise]:
+        box = (top, anchor_row, takeoff, col + landing)
+        if _is_empty(tilemap, box):
+            return box
+    # 右侧起跳
+    takeoff = max(col + length, start - 1)
+    if takeoff <= min(end - 1, tilemap.cols - width) and takeoff - (col + length) <= REACH_COLS[rise]:
+        box = (top, anchor_row, col + length - landing, takeoff + width)
+        if _is_empty(tilemap, box):
+            return box
+    return None
+
+
+def is_free(tilemap, row, col, length, clearance=PLAYER_HEIGHT_ROWS, margin=PLAYER_WIDTH_COLS):
+    """占用检查：平台左右 margin 列、上下 clearance 行内没有其他瓦片（直接在瓦片数组上切片，开销与长度成正比）
+
+    默认留出玩家的宽度和高度，玩家总能从平台之间穿过、在平台上走到边缘。
+    """
+    if col < 0 or col + length > tilemap.cols:
+        return False
+    lo = max(col - margin, 0)
+    hi = col + length + margin
+    for r in range(max(row - clearance, 0), min(row + clearance + 1, tilemap.rows)):
+        if any(tilemap.tiles[r][lo:hi]):
+            return False
+    return True
+
+
+def generate_platforms(num_platforms, difficulty, tilemap=None, rng=random):
+    """生成 num_platforms 个保证可达的平台，直接写入 tilemap，返回 (x, y, 长度) 列表
+
+    每个新平台都以一个已可达的站立面为锚点，在跳跃范围内随机放置，并把跳上去经过的区域
+    标记为保留；之后的平台不能放进保留区域，先放的平台因此一直可达。
+    每个平台最多随机尝试 MAX_ATTEMPTS 次，失败时从上次扫描停下的位置继续按固定顺序扫描候选位置。
+    瓦片和保留区域只增不减，扫描时否决过的位置以后也不会变得可用，
+    所以整次生成中每个候选位置最多检查一次，扫描到头就停止生成。
+    """
+    if tilemap is None:
+        tilemap = TileMap()
+        tilemap.fill(0, tilemap.rows - 1, tilemap.cols)
+    min_row = -(-(100 - tilemap.origin_y) // BLOCK_SIZE)
+    max_row = tilemap.row_at(SCREEN_HEIGHT - 3 * BLOCK_SIZE)
+    min_width = max(3 - (difficulty - 1), 1)
+    max_width = max(10 - (difficulty - 1), 3)
+
+    # 已有地形（地面等）都是可达的站立面
+    anchors = [(row, col, col + length) for col, row, length, tile in tilemap.spans()]
+    reserved = [bytearray(tilemap.cols) for _ in range(tilemap.rows)]
+    scan = _scan(tilemap, anchors, reserved, min_row, max_row, min_width)
+    platforms = []
+    for _ in range(num_platforms):
+        placed = _place_random(tilemap, anchors, reserved, rng, min_row, max_row, min_width, max_width)
+        if placed is None:
+            placed = next(scan, None)
+        if placed is None:
+            break  # 地图已经放不下任何可达平台
+        row, col, length, (top, bottom, left, right) = placed
+        tilemap.fill(col, row, length, GROUND)
+        anchors.append((row, col, col + length))
+        for r in range(top, bottom):
+            reserved[r][left:right] = b"\1" * (right - left)
+        platforms.append((tilemap.origin_x + col * BLOCK_SIZE, tilemap.row_top(row), length))
+    return platforms
+
+
+def _try_place(tilemap, anchor, reserved, row, col, length):
+    """位置可用时返回 (行, 列, 长度, 跳跃区域)，否则返回 None"""
+    if any(reserved[row][col:col + length]) or not is_free(tilemap, row, col, length):
+        return None
+    corridor = jump_corridor(tilemap, anchor, row, col, length)
+    if corridor is None:
+        return None
+    return row, col, length, corridor
+
+
+def _place_random(tilemap, anchors, reserved, rng, min_row, max_row, min_width, max_width):
+    """在随机锚点的跳跃范围内随机找位置"""
+    for _ in range(MAX_ATTEMPTS):
+        anchor = anchors[rng.randrange(len(anchors))]
+        anchor_row, start, end = anchor
+        length = rng.randint(min_width, max_width)
+        rise = rng.randint(2, MAX_RISE_ROWS) if MAX_RISE_ROWS >= 2 else 1
+        row = anchor_row - rise
+        if not min_row <= row <= max_row:
+            continue
+        reach = REACH_COLS[rise]
+        col = rng.randint(max(start - reach - length, 0), min(end + reach, tilemap.cols - length))
+        placed = _try_place(tilemap, anchor, reserved, row, col, length)
+        if placed is not None:
+            return placed
+    return None
+
+
+def _scan(tilemap, anchors, reserved, min_row, max_row, length):
+    """按固定顺序依次给出所有锚点跳跃范围内的可用位置（最短平台），随机尝试都失败时兜底
+
+    生成器在两次取值之间保留扫描进度；新放的平台追加到 anchors 末尾，之后也会被扫描到。
+    """
+    index = 0
+    while index < len(anchors):
+        anchor = anchors[index]
+        anchor_row, start, end = anchor
+        for rise in range(1, MAX_RISE_ROWS + 1):
+            row = anchor_row - rise
+            if not min_row <= row <= max_row:
+                continue
+            # 起跳位置可以探出站立面一列，两侧各多留出玩家宽度
+            reach = REACH_COLS[rise] + PLAYER_WIDTH_COLS
+            for col in range(max(start - reach - length, 0), min(end + reach, tilemap.cols - length) + 1):
+                placed = _try_place(tilemap, anchor, reserved, row, col, length)
+                if placed is not None:
+                    yield placed
+        index += 1
+
+
+def build_level(difficulty, num_platforms=NUM_PLATFORMS, rng=random, tilemap=None):
+    """生成一关地形：底部地面加随机平台，返回 TileMap（可传入空的 tilemap 指定尺寸和位置）"""
+    if tilemap is None:
+        tilemap = TileMap()
+    tilemap.fill(0, tilemap.rows - 1, tilemap.cols)
+    generate_platforms(num_platforms, difficulty, tilemap, rng)
+    return tilemap
+
+
+def level_for(seed, index, difficulty):
+    """整局中第 index 关（难度 difficulty）的地形
+
+    随机数只由 (种子, 关卡序号) 决定，与何时、在哪个线程生成无关，
+    因此可以提前在后台生成而不影响回放的一致性。
+    """
+    tilemap = build_level(difficulty, rng=random.Random(f"{seed}:{index}"))
+    tilemap.grid  # 同时建好碰撞索引
+    return tilemap
+
+
+def chunk_for(seed, index, chunk, difficulty, cols=CHUNK_COLS):
+    """滚动模式下第 index 局的第 chunk 个区块（随机数只由种子、局序号和区块序号决定）
+
+    每个区块自带一整条地面，相邻区块的地面首尾相接，所以每个区块内的平台只需保证从本区块地面可达；
+    平台之间至少留出玩家的高度，沿地面一直向右总能通过。
+    """
+    tilemap = TileMap(cols=cols, origin_x=chunk * cols * BLOCK_SIZE)
+    build_level(difficulty, rng=random.Random(f"{seed}:{index}:{chunk}"), tilemap=tilemap)
+    tilemap.grid  # 同时建好碰撞索引
+    return tilemap
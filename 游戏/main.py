@@ -1,233 +1,177 @@
 import pygame
-import os
-import random
-from player import Player
-from enemy import Enemy
-from block import Block
+import argparse
+import atlas
+import fonts
+import savestate
+from render import Renderer
+from hud import HUD
+from pipeline import RenderThread, capture
+from pacing import FramePacer
+from world import World, InputState
+from replay import InputRecorder, InputReplay
+from profiler import Profiler, NULL_PROFILER
 from constants import *
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="踩踩棒")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（相同种子 + 相同输入 = 相同的一局）")
+    parser.add_argument("--record", metavar="FILE", help="把每帧输入录制到文件")
+    parser.add_argument("--replay", metavar="FILE", help="回放录像文件")
+    parser.add_argument("--profile", action="store_true", help="开启分阶段耗时统计（F3 显示，F4 导出 CSV）")
+    parser.add_argument("--profile-csv", metavar="FILE", help="退出时把每帧耗时导出到 CSV")
+    parser.add_argument("--swarm", action="store_true", help="用 NumPy 批量更新敌人（需要 numpy）")
+    parser.add_argument("--scroll", action="store_true", help="滚动模式：世界向右无限延伸，摄像机跟随玩家")
+    parser.add_argument("--render-thread", action="store_true",
+                        help="在单独的线程绘制（逻辑帧率不受绘制卡顿影响，退出时打印快照延迟和丢帧）")
+    parser.add_argument("--max-frame-skip", type=int, default=MAX_FRAME_SKIP,
+                        help="绘制跟不上时最多连续跳过几次绘制来追赶逻辑（0 表示不追赶，游戏变慢）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     pygame.init()
 
-    # 初始化字体（保持原代码不变）
-    font_names = ["SimHei", "WenQuanYi Micro Hei", "Heiti TC", "Microsoft YaHei"]
-    font = None
-    for name in font_names:
-        try:
-            font = pygame.font.SysFont(name, 36)
-            print(f"使用系统字体: {name}")
-            break
-        except:
-            continue
-    if not font:
-        print("警告：未找到中文字体，使用默认字体")
-        font = pygame.font.SysFont(None, 36)
+    # 初始化字体：按缓存的字体文件直接打开，只有第一次启动时才扫描系统字体
+    font = fonts.load_font(36)
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("踩踩棒")
-    clock = pygame.time.Clock()
-
-    # 游戏难度设置（保持原代码不变）
-    difficulty_level = 1
-    SCORE_TO_INCREASE_DIFFICULTY = 10
-
-    # 平台生成函数
-    def is_overlapping(new_platform, existing_platforms):
-        new_x, new_y, new_length = new_platform
-        new_rect = pygame.Rect(new_x, new_y, new_length * BLOCK_SIZE, BLOCK_SIZE)
-        for plat in existing_platforms:
-            x, y, length = plat
-            rect = pygame.Rect(x, y, length * BLOCK_SIZE, BLOCK_SIZE)
-            if new_rect.colliderect(rect):
-                return True
-        return False
-
-    def generate_platforms(num_platforms, difficulty):
-        platforms = []
-        max_attempts = 100
-        for _ in range(num_platforms):
-            attempt = 0
-            while attempt < max_attempts:
-                min_width = max(3 - (difficulty - 1), 1)
-                max_width = max(10 - (difficulty - 1), 3)
-                platform_width = random.randint(min_width, max_width) * BLOCK_SIZE
-                platform_x = random.randint(0, SCREEN_WIDTH - platform_width)
-                platform_y = random.randint(100, SCREEN_HEIGHT - 3 * BLOCK_SIZE)
-                platform_length = platform_width // BLOCK_SIZE
-                new_platform = (platform_x, platform_y, platform_length)
-                if not is_overlapping(new_platform, platforms):
-                    platforms.append(new_platform)
-                    break
-                attempt += 1
-        return platforms
-
-    # 生成初始平台（保持原代码不变）
-    platforms = generate_platforms(5, difficulty_level)
-
-    # 创建地图（保持原代码不变）
-    blocks = []
-    for x in range(0, SCREEN_WIDTH, BLOCK_SIZE):
-        blocks.append(Block(x, SCREEN_HEIGHT - BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE))
-    for plat in platforms:
-        x, y, length = plat
-        for i in range(length):
-            blocks.append(Block(x + i * BLOCK_SIZE, y, BLOCK_SIZE, BLOCK_SIZE))
-
-    # 初始化玩家（保持原代码不变）
-    player = Player(100, SCREEN_HEIGHT - BLOCK_SIZE - int(16 * CHARACTER_SCALE), 16, 16)
-
-    # 初始化敌人（保持原代码不变）
-    enemies = [
-        Enemy(200, SCREEN_HEIGHT - BLOCK_SIZE - int(16 * CHARACTER_SCALE), 16, 16),
-        Enemy(400, SCREEN_HEIGHT - 150 - int(16 * CHARACTER_SCALE), 16, 16),
-        Enemy(600, SCREEN_HEIGHT - 250 - int(16 * CHARACTER_SCALE), 16, 16)
-    ]
-
-    # 游戏状态
-    score = 0
-    game_over = False
-    max_health = 5  # 最大生命值限制
-
-    # 敌人生成计时器（保持原代码不变）
-    enemy_spawn_timer = 0
-    ENEMY_SPAWN_DELAY = 5000
-
-    # 生命加成相关变量
-    health_added = False  # 是否添加了生命
-    health_added_timer = 0  # 生命加成提示计时器
-    HEALTH_ADD_DURATION = 2000  # 提示显示时间（毫秒）
-    HEALTH_ADD_PROBABILITY = 0.1  # 杀怪加血概率（10%）
+    # 固定步长：每秒推进 FPS 步逻辑，绘制慢时跳过绘制追赶
+    pacer = FramePacer(FPS, args.max_frame_skip)
+    renderer = Renderer(screen, DIRTY_RECT_RENDERING)
+    hud = HUD(font)
+    profiler = Profiler(enabled=args.profile or bool(args.profile_csv))
+
+    # 预加载共享资源：从预烘焙图集恢复（首次运行或素材变化时自动重新生成），之后创建方块、敌人不再读盘和缩放
+    with profiler.phase("assets"):
+        atlas.install()
+
+    # 游戏世界（逻辑与窗口解耦，窗口只负责输入和绘制）
+    replay = InputReplay(args.replay) if args.replay else None
+    world = World(replay.seed if replay else args.seed, profiler, prefetch=True,
+                  swarm=replay.swarm if replay else args.swarm,
+                  scrolling=replay.scrolling if replay else args.scroll)
+    recorder = InputRecorder(world.seed, world.scrolling, world.swarm) if args.record else None
+    print(f"随机种子: {world.seed}")
+
+    # 存档：F5 保存检查点、F9 读取，按住退格键倒带（录制和回放时不可用，录像只记录输入）
+    rewind = savestate.Rewind() if not (recorder or replay) else None
+    checkpoint = None
+
+    # 可选：渲染线程从快照绘制，主线程只处理输入和推进逻辑
+    render_thread = RenderThread(screen, renderer, hud, profiler) if args.render_thread else None
+    if render_thread:
+        render_thread.start()
 
     # 主游戏循环
     running = True
     while running:
-        current_time = pygame.time.get_ticks()
-
         # 处理事件（保持原代码不变）
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.enabled = True
+                profiler.show_overlay = not profiler.show_overlay
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.enabled:
+                path = args.profile_csv or "profile.csv"
+                print(f"已导出 {profiler.dump_csv(path)} 帧耗时: {path}")
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and rewind:
+                checkpoint = savestate.dump(world)
+                print(f"已保存检查点: 第 {world.tick} 帧，{len(checkpoint)} 字节")
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and checkpoint:
+                savestate.restore(world, checkpoint)
+                print(f"已读取检查点: 第 {world.tick} 帧")
+
+        keys = pygame.key.get_pressed()
+        # 按真实时间决定这次推进几步逻辑（落后时多步，中间不绘制）
+        for _ in range(pacer.due()):
+            # 读取本步输入（回放模式下来自录像文件）
+            if replay:
+                if replay.finished:
+                    break
+                inputs = replay.next_input()
+            else:
+                inputs = InputState.from_keys(keys)
+            if recorder:
+                recorder.record(inputs)
+
+            # 推进一步游戏逻辑（倒带时改为退回上一步）
+            if rewind and keys[pygame.K_BACKSPACE]:
+                rewind.rewind(world)
+            else:
+                world.step(inputs)
+                if rewind:
+                    rewind.record(world)
+        if replay and replay.finished:
+            break
 
-        if not game_over:
-            # 游戏逻辑更新（保持原代码不变）
-            player.move(blocks)
-
-            # 检查是否需要提升难度（保持原代码不变）
-            if score % SCORE_TO_INCREASE_DIFFICULTY == 0 and score > 0:
-                new_difficulty = (score // SCORE_TO_INCREASE_DIFFICULTY) + 1
-                if new_difficulty > difficulty_level:
-                    difficulty_level = new_difficulty
-                    platforms = generate_platforms(5, difficulty_level)
-                    blocks = []
-                    for x in range(0, SCREEN_WIDTH, BLOCK_SIZE):
-                        blocks.append(Block(x, SCREEN_HEIGHT - BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE))
-                    for plat in platforms:
-                        x, y, length = plat
-                        for i in range(length):
-                            blocks.append(Block(x + i * BLOCK_SIZE, y, BLOCK_SIZE, BLOCK_SIZE))
-
-            # 更新敌人
-            for enemy in enemies[:]:
-                enemy.move(blocks, SCREEN_WIDTH)
-                if enemy.check_collision_with_player(player):
-                    enemies.remove(enemy)
-                    score += 1
-
-                    # 新增功能：随机加命
-                    if random.random() < HEALTH_ADD_PROBABILITY and player.health < max_health:
-                        player.health += 1
-                        health_added = True
-                        health_added_timer = current_time
-
-            # 检查敌人是否碰到玩家侧面（保持原代码不变）
-            for enemy in enemies:
-                if (player.rect.right > enemy.rect.left and
-                        player.rect.left < enemy.rect.right and
-                        player.rect.bottom > enemy.rect.top + 10 and
-                        player.rect.top < enemy.rect.bottom):
-                    if player.hit():
-                        if player.health <= 0:
-                            player.die()  # 调用玩家的死亡方法
-                            game_over = True  # 设置游戏结束状态
-
-            # 敌人生成（保持原代码不变）
-            if current_time - enemy_spawn_timer > ENEMY_SPAWN_DELAY:
-                spawn_positions = [
-                    (100, SCREEN_HEIGHT - BLOCK_SIZE - int(16 * CHARACTER_SCALE)),
-                    (300, SCREEN_HEIGHT - 200 - int(16 * CHARACTER_SCALE)),
-                    (500, SCREEN_HEIGHT - 150 - int(16 * CHARACTER_SCALE)),
-                    (700, SCREEN_HEIGHT - 250 - int(16 * CHARACTER_SCALE))
-                ]
-                spawn_pos = spawn_positions[random.randint(0, len(spawn_positions) - 1)]
-                enemies.append(Enemy(spawn_pos[0], spawn_pos[1], 16, 16))
-                enemy_spawn_timer = current_time
-
-            # 检查生命加成提示是否过期
-            if health_added and current_time - health_added_timer > HEALTH_ADD_DURATION:
-                health_added = False
-
-        # 绘制游戏
-        screen.fill(SKY_BLUE)
-
-        # 绘制玩家和敌人（保持原代码不变）
-        player.draw(screen)
-        for block in blocks:
-            block.draw(screen)
-        for enemy in enemies:
-            enemy.draw(screen)
-
-        # 绘制分数和血量（保持原代码不变）
-        score_text = font.render(f"分数: {score}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 10))
-
-        health_text = font.render(f"生命: {player.health}", True, (255, 255, 255))
-        screen.blit(health_text, (10, 50))
-
-        difficulty_text = font.render(f"难度: {difficulty_level}", True, (255, 255, 255))
-        screen.blit(difficulty_text, (10, 90))
-
-        # 绘制生命加成提示
-        if health_added:
-            add_health_text = font.render("+1 生命!", True, (0, 255, 0))
-            screen.blit(add_health_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 100))
-
-        # 游戏结束显示（保持原代码不变）
-        if game_over:
-            game_over_text = font.render("游戏结束", True, (255, 0, 0))
-            restart_text = font.render("按 R 键重新开始", True, (255, 255, 255))
-            screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50))
-            screen.blit(restart_text, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2))
-
-            # 检查重新开始（保持原代码不变）
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_r]:
-                player.health = 3
-                score = 0
-                player.is_dead = False
-                game_over = False
-                difficulty_level = 1
-                platforms = generate_platforms(5, difficulty_level)
-                blocks = []
-                for x in range(0, SCREEN_WIDTH, BLOCK_SIZE):
-                    blocks.append(Block(x, SCREEN_HEIGHT - BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE))
-                for plat in platforms:
-                    x, y, length = plat
-                    for i in range(length):
-                        blocks.append(Block(x + i * BLOCK_SIZE, y, BLOCK_SIZE, BLOCK_SIZE))
-                enemies.clear()
-                enemies.extend([
-                    Enemy(200, SCREEN_HEIGHT - BLOCK_SIZE - int(16 * CHARACTER_SCALE), 16, 16),
-                    Enemy(400, SCREEN_HEIGHT - 150 - int(16 * CHARACTER_SCALE), 16, 16),
-                    Enemy(600, SCREEN_HEIGHT - 250 - int(16 * CHARACTER_SCALE), 16, 16)
-                ])
-
-        # 更新显示（保持原代码不变）
-        pygame.display.flip()
-        clock.tick(FPS)
-
+        if render_thread:
+            # 交给渲染线程绘制，这里不等待
+            with profiler.phase("snapshot"):
+                render_thread.publish(capture(world))
+        else:
+            # 绘制游戏
+            draw(world, screen, renderer, hud, profiler)
+
+            # 更新显示（脏矩形模式下只提交变化区域）
+            with profiler.phase("present"):
+                renderer.present()
+        profiler.end_frame()
+        pacer.frame()
+        pacer.wait()
+
+    sim_hz, render_hz = pacer.rates()
+    # 渲染线程模式下主循环每次只发布快照，实际绘制频率由渲染线程统计
+    print(f"帧节奏: 逻辑 {sim_hz:.1f} Hz，{'发布快照' if render_thread else '绘制'} {render_hz:.1f} Hz，"
+          f"追赶时跳过{'发布' if render_thread else '绘制'} {pacer.skipped} 次，超出上限放弃 {pacer.dropped} 步")
+    if render_thread:
+        render_thread.stop()
+        rendered, dropped, (mean, p95, worst) = render_thread.stats()
+        print(f"渲染线程: 绘制 {rendered} 帧（{render_thread.rate():.1f} Hz），丢弃 {dropped} 帧，"
+              f"快照延迟 平均 {mean:.2f} / p95 {p95:.2f} / 最大 {worst:.2f} ms")
+    if recorder:
+        recorder.save(args.record, world)
+        print(f"已录制 {len(recorder.frames)} 帧: {args.record}")
+    if replay:
+        print(f"回放结果{'一致' if replay.verify(world) else '不一致'}")
+    if args.profile_csv:
+        print(f"已导出 {profiler.dump_csv(args.profile_csv)} 帧耗时: {args.profile_csv}")
+    if world.level_switches > 1:
+        print(f"关卡切换 {world.level_switches} 次，最慢 {world.worst_switch_ms:.3f} ms")
+    world.close()
     pygame.quit()
 
 
+def draw(world, screen, renderer, hud, profiler=NULL_PROFILER):
+    """绘制一帧画面"""
+    # 天空和地形已预先烘焙到关卡背景中（滚动模式下由视野内的区块拼成，摄像机移动时整屏重绘）
+    camera = world.camera
+    with profiler.phase("terrain"):
+        background, moved = world.level.view(camera)
+        renderer.set_background(background)
+        if moved:
+            renderer.invalidate()
+        renderer.begin()
+
+    # 绘制玩家和视野内的敌人
+    with profiler.phase("entities"):
+        player = world.player
+        image = player.image(world.time)
+        if image is not None:
+            renderer.submit(image, (player.rect.x - camera.x, player.rect.y))
+        world.enemies.draw(renderer, camera)
+
+    with profiler.phase("hud"):
+        hud.draw(world, renderer)
+    profiler.draw_overlay(screen, renderer)
+
+    # 按层批量绘制本帧提交的全部命令
+    with profiler.phase("blits"):
+        renderer.flush()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,69 @@
+# pacing.py
+import time
+from collections import deque
+from constants import FPS, MAX_FRAME_SKIP
+
+
+class FramePacer:
+    """固定步长的帧节奏控制
+
+    每秒真实时间推进 rate 步逻辑，与绘制快慢无关。绘制跟不上时一次循环推进多步、
+    跳过中间的绘制来追赶，最多连续跳过 max_skip 次；落后更多时放弃追赶（游戏暂时变慢），
+    避免越追越落后。
+    """
+
+    def __init__(self, rate=FPS, max_skip=MAX_FRAME_SKIP, window=1.0, clock=time.perf_counter, sleep=time.sleep):
+        self.step_time = 1 / rate
+        self.max_skip = max_skip
+        self.window = window  # 统计实际频率的时间窗口（秒）
+        self.clock = clock
+        self.sleep = sleep
+        self.next_step = None  # 下一步逻辑应当开始的时刻
+        self.steps = 0    # 累计逻辑步数
+        self.frames = 0   # 累计绘制帧数
+        self.skipped = 0  # 为追赶而跳过的绘制次数
+        self.dropped = 0  # 超出追赶上限、放弃的逻辑步数
+        self._samples = deque()  # (时刻, 累计步数, 累计帧数)
+
+    def due(self):
+        """本次循环应推进的逻辑步数（至少 1 步）"""
+        now = self.clock()
+        if self.next_step is None:
+            self.next_step = now
+        count = int((now - self.next_step) / self.step_time) + 1
+        limit = self.max_skip + 1
+        if count > limit:
+            self.dropped += count - limit
+            count = limit
+            self.next_step = now + self.step_time
+        else:
+            self.next_step += count * self.step_time
+        self.steps += count
+        self.skipped += count - 1
+        return count
+
+    def frame(self):
+        """记录绘制了一帧"""
+        self.frames += 1
+        now = self.clock()
+        samples = self._samples
+        samples.append((now, self.steps, self.frames))
+        while len(samples) > 2 and now - samples[0][0] > self.window:
+            samples.popleft()
+
+    def wait(self):
+        """等到下一步逻辑的时刻（代替 clock.tick）"""
+        delay = self.next_step - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+    def rates(self):
+        """最近一段时间的实际 (逻辑 Hz, 绘制 Hz)"""
+        samples = self._samples
+        if len(samples) < 2:
+            return 0.0, 0.0
+        (start, steps, frames), (end, last_steps, last_frames) = samples[0], samples[-1]
+        elapsed = end - start
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return (last_steps - steps) / elapsed, (last_frames - frames) / elapsed
@@ -0,0 +1,150 @@
+# pipeline.py
+import time
+import threading
+from collections import namedtuple, deque
+import pygame
+from chunks import compose
+from profiler import NULL_PROFILER
+
+# 流水线渲染：模拟线程每帧生成一份不可变的快照，渲染线程总是绘制最新的一份。
+# 绘制慢了只会丢帧，不会拖慢下一次逻辑更新（SDL 的 blit 和 flip 会释放 GIL）。
+
+
+class Snapshot(namedtuple("Snapshot", "tick time created camera_x backgrounds sprites "
+                                      "score health difficulty_level health_added game_over")):
+    """一帧画面需要的全部数据
+
+    sprites 为 (图片, 屏幕坐标) 元组，图片是共享的只读 Surface；
+    backgrounds 为 (背景图, 世界 x 坐标) 元组；created 为生成时刻（perf_counter 秒）。
+    """
+    __slots__ = ()
+
+
+def capture(world):
+    """从世界当前状态生成快照（在模拟线程调用）"""
+    camera = world.camera
+    player = world.player
+    sprites = []
+    image = player.image(world.time)
+    if image is not None:
+        sprites.append((image, (player.rect.x - camera.x, player.rect.y)))
+    sprites.extend(world.enemies.sprites(camera))
+    return Snapshot(world.tick, world.time, time.perf_counter(), camera.x, world.level.backgrounds,
+                    tuple(sprites), world.score, player.health, world.difficulty_level,
+                    world.health_added, world.game_over)
+
+
+class SnapshotBuffer:
+    """快照的三缓冲交换
+
+    快照不可变，交换的只是引用：模拟线程正在生成的、最近发布的、渲染线程正在绘制的
+    三份互不干扰。发布从不等待渲染线程，来不及绘制的旧快照直接被新的替换。
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._latest = None
+        self._sequence = 0  # 已发布的快照数
+
+    def publish(self, snapshot):
+        with self._condition:
+            self._latest = snapshot
+            self._sequence += 1
+            self._condition.notify()
+
+    def take(self, after, timeout=None):
+        """等待序号大于 after 的快照，返回 (序号, 快照)；超时时序号不变"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > after, timeout)
+            return self._sequence, self._latest
+
+
+class RenderThread(threading.Thread):
+    """从快照缓冲中取最新快照绘制并提交画面，统计快照延迟和丢帧
+
+    启动后屏幕只能由这个线程绘制。
+    """
+
+    def __init__(self, screen, renderer, hud, profiler=NULL_PROFILER, window=300):
+        super().__init__(name="render", daemon=True)
+        self.buffer = SnapshotBuffer()
+        self.screen = screen
+        self.renderer = renderer
+        self.hud = hud
+        self.profiler = profiler
+        self.running = True
+        self.rendered = 0
+        self.dropped = 0  # 被更新的快照覆盖、没有画出来的快照数
+        self.ages = deque(maxlen=window)  # 最近若干帧：快照生成到画面提交的间隔（毫秒）
+        self.presented = deque(maxlen=window)  # 最近若干帧：画面提交的时刻（perf_counter 秒）
+        self._view = None
+        self._view_key = None
+
+    def publish(self, snapshot):
+        """提交一份快照（模拟线程调用）"""
+        self.buffer.publish(snapshot)
+
+    def stop(self):
+        self.running = False
+        self.buffer.publish(None)
+        self.join()
+
+    def run(self):
+        seen = 0
+        while self.running:
+            sequence, snapshot = self.buffer.take(seen, 0.1)
+            if sequence == seen or snapshot is None:
+                continue
+            self.dropped += sequence - seen - 1
+            seen = sequence
+            self.render(snapshot)
+            now = time.perf_counter()
+            self.ages.append((now - snapshot.created) * 1000)
+            self.presented.append(now)
+            self.rendered += 1
+
+    def background(self, snapshot):
+        """快照对应的整屏背景和它是否变化；单屏关卡直接使用关卡背景"""
+        backgrounds = snapshot.backgrounds
+        size = self.screen.get_size()
+        if len(backgrounds) == 1 and backgrounds[0][1] == snapshot.camera_x and backgrounds[0][0].get_size() == size:
+            return backgrounds[0][0], False
+        key = (snapshot.camera_x, backgrounds)
+        if key == self._view_key:
+            return self._view, False
+        if self._view is None:
+            self._view = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self._view = self._view.convert()
+        compose(self._view, backgrounds, snapshot.camera_x)
+        self._view_key = key
+        return self._view, True
+
+    def render(self, snapshot):
+        """绘制并提交一帧"""
+        renderer = self.renderer
+        background, moved = self.background(snapshot)
+        renderer.set_background(background)
+        if moved:
+            renderer.invalidate()
+        renderer.begin()
+        renderer.submit_many(snapshot.sprites)
+        self.hud.draw_state(renderer, snapshot.score, snapshot.health, snapshot.difficulty_level,
+                            snapshot.health_added, snapshot.game_over)
+        self.profiler.draw_overlay(self.screen, renderer)
+        renderer.present()
+
+    def rate(self):
+        """最近若干帧实际绘制并提交画面的频率（Hz）"""
+        presented = self.presented
+        if len(presented) < 2 or presented[-1] <= presented[0]:
+            return 0.0
+        return (len(presented) - 1) / (presented[-1] - presented[0])
+
+    def stats(self):
+        """(已绘制帧数, 丢帧数, 快照延迟 平均/p95/最大 毫秒)"""
+        ages = sorted(self.ages)
+        if not ages:
+            return self.rendered, self.dropped, (0.0, 0.0, 0.0)
+        return self.rendered, self.dropped, (sum(ages) / len(ages),
+                                             ages[min(len(ages) - 1, int(len(ages) * 0.95))], ages[-1])
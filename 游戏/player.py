@@ -1,14 +1,20 @@
 import pygame
 import os
-from utils import load_sprite_sheets
+import assets
+from animation import player_clips, IDLE, RUN, JUMP, LEFT, RIGHT
 from constants import PLAYER_SPEED, GRAVITY, JUMP_POWER, SCREEN_WIDTH, SCREEN_HEIGHT, CHARACTER_SCALE
 
 
-class Player(pygame.sprite.Sprite):
+class Player:
+    """玩家角色：实例只保存自身状态，精灵图片引用共享的动画表"""
+    __slots__ = ("clips", "death_image", "is_dead", "death_time", "DEATH_DURATION", "rect", "speed",
+                 "animation_count", "sprite", "velocity_x", "velocity_y", "direction", "on_ground",
+                 "health", "invincible", "invincible_time", "INVINCIBLE_DURATION", "min_x", "max_x",
+                 "gravity", "jump_power")
+
     def __init__(self, x, y, width, height):
-        super().__init__()
-        # 加载所有精灵表
-        self.SPRITES = load_sprite_sheets("MainCharacters", "Mario", 16, 16, True)
+        # 动画表（所有实例共享）
+        self.clips = player_clips()
 
         # 新增：死亡图片（单独加载）
         self.death_image = self.load_death_image()
@@ -20,12 +26,18 @@ class Player(pygame.sprite.Sprite):
         scaled_height = int(height * CHARACTER_SCALE)
         self.rect = pygame.Rect(x, y, scaled_width, scaled_height)
         self.speed = PLAYER_SPEED
+        # 物理参数（默认取常量，可按实例调整，用于参数扫描）
+        self.gravity = GRAVITY
+        self.jump_power = JUMP_POWER
         self.animation_count = 0
-        self.sprite = self.SPRITES["idle_right"][0]
+        self.sprite = self.clips[IDLE][RIGHT].frames[0]
         self.velocity_x = 0
         self.velocity_y = 0
-        self.direction = "right"
+        self.direction = RIGHT
         self.on_ground = False
+        # 水平活动范围（滚动模式下随摄像机和已加载区块变化）
+        self.min_x = 0
+        self.max_x = SCREEN_WIDTH
 
         # 血量系统
         self.health = 3
@@ -39,11 +51,10 @@ class Player(pygame.sprite.Sprite):
         """加载单独的死亡图片"""
         try:
             death_path = os.path.join("assets", "MainCharacters", "Mario", "death.png")
-            death_image = pygame.image.load(death_path).convert_alpha()
-            # 缩放图片到角色大小
+            # 缩放图片到角色大小（经由共享缓存，只加载一次）
             scaled_width = int(16 * CHARACTER_SCALE)
             scaled_height = int(16 * CHARACTER_SCALE)
-            return pygame.transform.scale(death_image, (scaled_width, scaled_height))
+            return assets.load_image(death_path, (scaled_width, scaled_height))
         except Exception as e:
             print(f"警告: 加载死亡图片失败: {e}")
             return None
@@ -54,47 +65,46 @@ class Player(pygame.sprite.Sprite):
             return
 
         if not self.on_ground:
-            sprite_sheet = "jump"
+            state = JUMP
         else:
-            sprite_sheet = "idle" if self.velocity_x == 0 else "run"
+            state = IDLE if self.velocity_x == 0 else RUN
 
-        sprite_key = f"{sprite_sheet}_{self.direction}"
-        sprite_index = (self.animation_count // 5) % len(self.SPRITES[sprite_key])
-        self.sprite = self.SPRITES[sprite_key][sprite_index]
+        self.sprite = self.clips[state][self.direction].frame(self.animation_count)
         self.animation_count += 1
 
-    def draw(self, screen):
-        """绘制角色到屏幕（处理死亡状态）"""
+    def image(self, now):
+        """当前应显示的图片（处理死亡状态和无敌闪烁），不显示时为 None；now 为当前模拟时间（毫秒）"""
         if self.is_dead:
-            if self.death_image:
-                screen.blit(self.death_image, (self.rect.x, self.rect.y))
-            return
+            return self.death_image
 
         # 正常状态下的绘制逻辑
-        if not self.invincible or (pygame.time.get_ticks() // 100) % 2 == 0:
-            screen.blit(self.sprite, (self.rect.x, self.rect.y))
+        if not self.invincible or (now // 100) % 2 == 0:
+            return self.sprite
+        return None
+
+    def move(self, blocks, inputs, now):
+        """处理角色移动和碰撞检测（死亡状态下不移动）
 
-    def move(self, blocks):
-        """处理角色移动和碰撞检测（死亡状态下不移动）"""
+        inputs 为本帧的输入快照，now 为当前模拟时间（毫秒）
+        """
         if self.is_dead:
             return
 
         self.velocity_x = 0
-        keys = pygame.key.get_pressed()
 
-        if keys[pygame.K_LEFT]:
+        if inputs.left:
             self.move_left()
-        if keys[pygame.K_RIGHT]:
+        if inputs.right:
             self.move_right()
-        if keys[pygame.K_SPACE] and self.on_ground:
+        if inputs.jump and self.on_ground:
             self.jump()
 
         # 更新无敌状态
-        if self.invincible and pygame.time.get_ticks() - self.invincible_time > self.INVINCIBLE_DURATION:
+        if self.invincible and now - self.invincible_time > self.INVINCIBLE_DURATION:
             self.invincible = False
 
         # 应用重力
-        self.velocity_y += GRAVITY
+        self.velocity_y += self.gravity
         self.on_ground = False
 
         # 水平移动和碰撞检测
@@ -112,25 +122,25 @@ class Player(pygame.sprite.Sprite):
     def move_left(self):
         """向左移动"""
         self.velocity_x = -self.speed
-        if self.direction != "left":
-            self.direction = "left"
+        if self.direction != LEFT:
+            self.direction = LEFT
             self.animation_count = 0
 
     def move_right(self):
         """向右移动"""
         self.velocity_x = self.speed
-        if self.direction != "right":
-            self.direction = "right"
+        if self.direction != RIGHT:
+            self.direction = RIGHT
             self.animation_count = 0
 
     def jump(self):
         """跳跃"""
-        self.velocity_y = JUMP_POWER
+        self.velocity_y = self.jump_power
         self.on_ground = False
 
     def handle_collision(self, direction, blocks):
-        """处理与方块的碰撞"""
-        for block in blocks:
+        """处理与方块的碰撞（blocks 为 SpatialGrid，只检查角色附近的格子）"""
+        for block in blocks.query(self.rect):
             if self.rect.colliderect(block.rect):
                 if direction == "x":
                     if self.velocity_x > 0:  # 向右移动
@@ -147,11 +157,11 @@ class Player(pygame.sprite.Sprite):
                         self.velocity_y = 0
 
     def keep_within_screen(self):
-        """确保角色在屏幕范围内"""
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
+        """确保角色在屏幕（滚动模式下为 min_x 到 max_x）范围内"""
+        if self.rect.left < self.min_x:
+            self.rect.left = self.min_x
+        if self.rect.right > self.max_x:
+            self.rect.right = self.max_x
         if self.rect.top < 0:
             self.rect.top = 0
             self.velocity_y = 0  # 防止飞出屏幕顶部后卡住
@@ -160,23 +170,23 @@ class Player(pygame.sprite.Sprite):
             self.on_ground = True
             self.velocity_y = 0
 
-    def hit(self):
+    def hit(self, now):
         """玩家受伤"""
         if not self.invincible:
             self.health -= 1
             self.invincible = True
-            self.invincible_time = pygame.time.get_ticks()
+            self.invincible_time = now
             self.velocity_y = -5  # 被击中后向上反弹
 
             # 检查是否死亡
             if self.health <= 0:
-                self.die()  # 调用死亡方法
+                self.die(now)  # 调用死亡方法
                 return True
         return False
 
-    def die(self):
+    def die(self, now):
         """玩家死亡处理"""
         self.is_dead = True
-        self.death_time = pygame.time.get_ticks()  # 记录死亡时间
+        self.death_time = now  # 记录死亡时间
         self.invincible = True  # 死亡后无敌，防止重复触发
 
@@ -0,0 +1,42 @@
+# prefetch.py
+from concurrent.futures import ThreadPoolExecutor
+from level import level_for
+
+
+def prepare_level(seed, index, difficulty):
+    """生成关卡并预先烘焙背景，切换时不再有任何生成工作"""
+    tilemap = level_for(seed, index, difficulty)
+    tilemap.background
+    return tilemap
+
+
+class LevelPrefetcher:
+    """在后台线程中提前生成可能用到的下一关（难度 +1 以及重新开始），切换时只需交换引用"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+        self.pending = {}  # (关卡序号, 难度) -> Future
+
+    def request(self, index, difficulty):
+        """提交后台生成任务（已提交的不重复提交）"""
+        key = (index, difficulty)
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(prepare_level, self.seed, index, difficulty)
+
+    def take(self, index, difficulty):
+        """取出生成好的关卡；还没生成完就等待，没有预取过就当场生成"""
+        future = self.pending.pop((index, difficulty), None)
+        # 其他候选已经用不上了
+        for stale in self.pending.values():
+            stale.cancel()
+        self.pending.clear()
+        if future is None:
+            return prepare_level(self.seed, index, difficulty)
+        return future.result()
+
+    def shutdown(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
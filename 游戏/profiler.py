@@ -0,0 +1,111 @@
+# profiler.py
+import csv
+import time
+from collections import deque
+from contextlib import nullcontext
+import pygame
+from render import LAYER_OVERLAY
+
+_NULL_PHASE = nullcontext()
+
+
+class _Phase:
+    """计时上下文：退出时把耗时记入当前帧"""
+    __slots__ = ("frame", "name", "start")
+
+    def __init__(self, frame, name):
+        self.frame = frame
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.frame[self.name] = self.frame.get(self.name, 0.0) + elapsed
+
+
+class Profiler:
+    """分阶段帧耗时统计
+
+    用 with profiler.phase("名称"): 包住要统计的代码；关闭时返回共享的空上下文，几乎没有开销。
+    每个阶段保留最近 window 帧的耗时，支持屏幕叠加显示和导出 CSV。
+    """
+
+    def __init__(self, enabled=False, window=300, history=36000):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.window = window
+        self.samples = {}  # 阶段 -> 最近 window 帧的耗时（毫秒）
+        self.history = deque(maxlen=history)  # 每帧各阶段耗时，用于导出 CSV
+        self.frame = {}
+        self.frame_count = 0
+        self._font = None
+
+    def phase(self, name):
+        """统计一个阶段的耗时"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self.frame, name)
+
+    def end_frame(self):
+        """结束一帧，把本帧数据归档"""
+        if not self.enabled:
+            return
+        frame = self.frame
+        for name, elapsed in frame.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        self.history.append((self.frame_count, frame))
+        self.frame_count += 1
+        self.frame = {}
+
+    def stats(self):
+        """各阶段最近若干帧的 平均/p95/最大 耗时（毫秒）"""
+        result = {}
+        # 渲染线程绘制叠加层时模拟线程可能正在归档新的一帧，先复制再遍历
+        for name, samples in list(self.samples.items()):
+            ordered = sorted(samples)
+            result[name] = (sum(ordered) / len(ordered),
+                            ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                            ordered[-1])
+        return result
+
+    def histogram(self, name, bucket_ms=0.25, buckets=20):
+        """某阶段最近若干帧耗时的直方图（最后一个桶包含所有更慢的帧）"""
+        counts = [0] * buckets
+        for elapsed in self.samples.get(name, ()):
+            counts[min(int(elapsed / bucket_ms), buckets - 1)] += 1
+        return counts
+
+    def draw_overlay(self, screen, renderer=None):
+        """在屏幕右上角显示各阶段耗时"""
+        if not (self.enabled and self.show_overlay):
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        y = 5
+        for name, (mean, p95, worst) in sorted(self.stats().items()):
+            text = self._font.render(f"{name:<14} {mean:6.2f} {p95:6.2f} {worst:6.2f} ms", True, (255, 255, 0))
+            pos = (screen.get_width() - text.get_width() - 5, y)
+            if renderer:
+                renderer.submit(text, pos, LAYER_OVERLAY)
+            else:
+                screen.blit(text, pos)
+            y += text.get_height()
+
+    def dump_csv(self, path):
+        """把每帧各阶段耗时导出为 CSV"""
+        names = sorted({name for _, frame in self.history for name in frame})
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + names)
+            for index, frame in self.history:
+                writer.writerow([index] + [f"{frame.get(name, 0.0):.4f}" for name in names])
+        return len(self.history)
+
+
+# 默认的关闭状态分析器，未传入分析器时使用
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,100 @@
+# render.py
+import pygame
+
+# 绘制层：数值小的先画，同一层按提交顺序（玩家在敌人之前，与原来的绘制顺序一致）
+LAYER_ENTITIES = 10
+LAYER_HUD = 20
+LAYER_OVERLAY = 30
+
+
+class Renderer:
+    """帧渲染器：负责恢复背景、收集绘制命令并提交画面
+
+    玩家、敌人和界面文字通过 submit 提交 (图片, 位置, 层)，帧末按层排序、
+    剔除屏幕外的部分，每层只调用一次 screen.blits。
+    dirty=False 时每帧整屏重绘并 flip；dirty=True 时只恢复上一帧绘制过的区域，
+    并用 pygame.display.update(rects) 只提交变化的矩形。
+    """
+
+    def __init__(self, screen, dirty=False):
+        self.screen = screen
+        self.dirty = dirty
+        self.background = None
+        self.previous = []  # 上一帧绘制过的区域
+        self.current = []   # 本帧绘制过的区域
+        self.full_redraw = True
+        self.layers = {}  # 层 -> 本帧的 (图片, 位置) 命令
+        self.screen_width, self.screen_height = screen.get_size()
+        # 最近一帧的统计
+        self.draw_calls = 0  # blits 调用次数
+        self.sprites = 0     # 实际绘制的图片数
+        self.culled = 0      # 完全在屏幕外被剔除的图片数
+
+    def set_background(self, background):
+        """切换背景（关卡变化时整屏重绘一次）"""
+        if background is not self.background:
+            self.background = background
+            self.full_redraw = True
+
+    def invalidate(self):
+        """要求下一次提交整屏刷新（如游戏结束画面）"""
+        self.full_redraw = True
+
+    def begin(self):
+        """开始一帧：恢复背景，清空绘制命令"""
+        self.layers = {}
+        screen = self.screen
+        if not self.dirty or self.full_redraw:
+            screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+
+    def submit(self, surface, pos, layer=LAYER_ENTITIES):
+        """提交一条绘制命令，帧末统一绘制"""
+        commands = self.layers.get(layer)
+        if commands is None:
+            self.layers[layer] = [(surface, pos)]
+        else:
+            commands.append((surface, pos))
+
+    def submit_many(self, commands, layer=LAYER_ENTITIES):
+        """提交一批 (图片, 位置) 命令"""
+        existing = self.layers.get(layer)
+        if existing is None:
+            self.layers[layer] = list(commands)
+        else:
+            existing.extend(commands)
+
+    def flush(self):
+        """按层绘制本帧提交的命令并记录区域"""
+        width, height = self.screen_width, self.screen_height
+        blits = self.screen.blits
+        current = self.current
+        calls = drawn = culled = 0
+        for layer in sorted(self.layers):
+            commands = self.layers[layer]
+            visible = [(surface, pos) for surface, pos in commands
+                       if pos[0] < width and pos[1] < height and
+                       pos[0] + surface.get_width() > 0 and pos[1] + surface.get_height() > 0]
+            culled += len(commands) - len(visible)
+            if visible:
+                current.extend(blits(visible))
+                calls += 1
+                drawn += len(visible)
+        self.layers = {}
+        self.draw_calls, self.sprites, self.culled = calls, drawn, culled
+
+    def present(self):
+        """绘制尚未绘制的命令并提交画面"""
+        if self.layers:
+            self.flush()
+        if not self.dirty or self.full_redraw:
+            pygame.display.flip()
+        else:
+            # 上一帧的位置需要擦除，本帧的位置需要显示
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+        self.full_redraw = False
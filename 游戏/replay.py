@@ -0,0 +1,100 @@
+# replay.py
+import struct
+import sys
+from world import World, InputState
+
+# 文件格式：头部（魔数、版本、模式标志、种子、帧数、最终状态摘要）+ 每帧 1 字节的按键位
+MAGIC = b"MRRP"
+# 3：玩家与敌人的接触改为按位置顺序判定；4：头部增加模式标志；5：平台生成保证玩家能跳上去；
+# 6：摘要中的敌人状态与存储顺序无关，标志增加 SWARM
+VERSION = 6
+HEADER = struct.Struct("<4sBBQI32s")
+
+# 模式标志
+SCROLLING = 1
+SWARM = 2  # 敌人使用 NumPy 批量后端
+
+# 每个按键占一位
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+RESTART = 8
+
+
+def encode_input(inputs):
+    """输入快照压缩成一个字节"""
+    return ((LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) |
+            (JUMP if inputs.jump else 0) | (RESTART if inputs.restart else 0))
+
+
+def decode_input(bits):
+    """一个字节还原为输入快照"""
+    return InputState(bool(bits & LEFT), bool(bits & RIGHT), bool(bits & JUMP), bool(bits & RESTART))
+
+
+class InputRecorder:
+    """录制每一帧的输入，配合世界种子即可完全复现一局"""
+
+    def __init__(self, seed, scrolling=False, swarm=False):
+        self.seed = seed
+        self.scrolling = scrolling
+        self.swarm = swarm
+        self.frames = bytearray()
+
+    def record(self, inputs):
+        self.frames.append(encode_input(inputs))
+
+    def save(self, path, world):
+        """写入录像文件，附带最终状态摘要用于回放校验"""
+        digest = bytes.fromhex(world.checksum())
+        with open(path, "wb") as f:
+            flags = (SCROLLING if self.scrolling else 0) | (SWARM if self.swarm else 0)
+            f.write(HEADER.pack(MAGIC, VERSION, flags, self.seed, len(self.frames), digest))
+            f.write(self.frames)
+
+
+class InputReplay:
+    """读取录像文件并按帧输出输入快照"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, flags, self.seed, count, self.digest = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"不支持的录像文件: {path}")
+        self.scrolling = bool(flags & SCROLLING)
+        self.swarm = bool(flags & SWARM)
+        self.frames = data[HEADER.size:HEADER.size + count]
+        self.position = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.frames)
+
+    def next_input(self):
+        """下一帧的输入"""
+        inputs = decode_input(self.frames[self.position])
+        self.position += 1
+        return inputs
+
+    def verify(self, world):
+        """回放结束后的状态是否与录制时完全一致"""
+        return bytes.fromhex(world.checksum()) == self.digest
+
+
+def run_headless(path):
+    """无窗口回放一个录像文件，返回 (世界, 是否一致)"""
+    replay = InputReplay(path)
+    world = World(replay.seed, swarm=replay.swarm, scrolling=replay.scrolling)
+    while not replay.finished:
+        world.step(replay.next_input())
+    return world, replay.verify(world)
+
+
+if __name__ == "__main__":
+    world, ok = run_headless(sys.argv[1])
+    print(f"回放 {world.tick} 帧，分数 {world.score}，结果{'一致' if ok else '不一致'}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,198 @@
+# savestate.py
+import struct
+from collections import deque
+from tilemap import TileMap
+from chunks import ChunkedLevel
+from enemy_pool import STATE_RECORD
+from constants import FPS
+
+# 游戏状态存档：世界、玩家、敌人、地形、计时器和随机数状态编码成一段紧凑的二进制，
+# 用于读档、倒带和长时间测试中的检查点。读档只改写现有对象的字段，不重新加载任何资源。
+MAGIC = b"MRSS"
+VERSION = 1
+
+# 模式标志
+SCROLLING = 1
+
+# 魔数、版本、标志、种子、帧数、分数、难度、是否结束、上次生成敌人时间、加命提示、加命提示时间、
+# 关卡序号、摄像机 x、生成间隔、敌人上限、每批数量
+WORLD = struct.Struct("<4sBBQqii?q?qiqiii")
+# Mersenne Twister 的 624 个状态字加位置，以及 gauss 的缓存值
+RNG = struct.Struct("<625I?d")
+# 位置、水平/垂直速度、方向、着地、生命、无敌、无敌开始时间、死亡、死亡时间、动画计数、
+# 当前图片在动画表中的序号、水平活动范围、重力、跳跃力量
+PLAYER = struct.Struct("<4iidb?i?q?qiHqqdd")
+COUNT = struct.Struct("<I")
+# 瓦片地图：左边的世界 x 坐标、列数、行数，之后是 列数 × 行数 个瓦片 id
+TILEMAP = struct.Struct("<qHH")
+
+_frame_tables = {}
+
+
+def _player_frames(clips):
+    """玩家动画表中的全部图片（按固定顺序），存档中用序号表示当前图片"""
+    table = _frame_tables.get(id(clips))
+    if table is None:
+        table = [frame for state in clips.values() for clip in state.values() for frame in clip.frames]
+        _frame_tables[id(clips)] = table
+    return table
+
+
+def _tilemaps(world):
+    """当前地形的全部瓦片地图（滚动模式下按区块顺序）"""
+    level = world.level
+    if isinstance(level, ChunkedLevel):
+        return [level.chunks[chunk] for chunk in sorted(level.chunks)]
+    return [level]
+
+
+def dump(world):
+    """把当前游戏状态编码为 bytes"""
+    player = world.player
+    policy = world.spawn_policy
+    parts = [WORLD.pack(MAGIC, VERSION, SCROLLING if world.scrolling else 0, world.seed, world.tick,
+                        world.score, world.difficulty_level, world.game_over, world.enemy_spawn_timer,
+                        world.health_added, world.health_added_timer, world.level_index, world.camera.x,
+                        policy.delay, policy.cap, policy.batch)]
+
+    _, internal, gauss = world.rng.getstate()
+    parts.append(RNG.pack(*internal, gauss is not None, gauss or 0.0))
+
+    frames = _player_frames(player.clips)
+    sprite = next(i for i, frame in enumerate(frames) if frame is player.sprite)
+    parts.append(PLAYER.pack(*player.rect, player.velocity_x, player.velocity_y, player.direction,
+                             player.on_ground, player.health, player.invincible, player.invincible_time,
+                             player.is_dead, player.death_time, player.animation_count, sprite,
+                             player.min_x, player.max_x, player.gravity, player.jump_power))
+
+    enemies = world.enemies.pack_state()
+    parts.append(COUNT.pack(len(enemies) // STATE_RECORD.size))
+    parts.append(enemies)
+
+    tilemaps = _tilemaps(world)
+    parts.append(COUNT.pack(len(tilemaps)))
+    for tilemap in tilemaps:
+        parts.append(TILEMAP.pack(tilemap.origin_x, tilemap.cols, tilemap.rows))
+        parts.append(tilemap.to_bytes())
+    return b"".join(parts)
+
+
+def tick_of(data):
+    """存档对应的帧数（不解码其余部分）"""
+    return WORLD.unpack_from(data)[4]
+
+
+def restore(world, data):
+    """把 dump 的结果恢复到 world（必须是同一种子、同一模式的世界）"""
+    (magic, version, flags, seed, tick, score, difficulty, game_over, spawn_timer, health_added,
+     health_added_timer, level_index, camera_x, delay, cap, batch) = WORLD.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("不支持的存档数据")
+    if seed != world.seed or bool(flags & SCROLLING) != world.scrolling:
+        raise ValueError("存档与当前世界的种子或模式不一致")
+    offset = WORLD.size
+
+    values = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    world.rng.setstate((3, values[:625], values[626] if values[625] else None))
+
+    (x, y, w, h, velocity_x, velocity_y, direction, on_ground, health, invincible, invincible_time, is_dead,
+     death_time, animation_count, sprite, min_x, max_x, gravity, jump_power) = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    player = world.player
+    player.rect.update(x, y, w, h)
+    player.velocity_x = velocity_x
+    player.velocity_y = velocity_y
+    player.direction = direction
+    player.on_ground = on_ground
+    player.health = health
+    player.invincible = invincible
+    player.invincible_time = invincible_time
+    player.is_dead = is_dead
+    player.death_time = death_time
+    player.animation_count = animation_count
+    player.sprite = _player_frames(player.clips)[sprite]
+    player.min_x = min_x
+    player.max_x = max_x
+    player.gravity = gravity
+    player.jump_power = jump_power
+
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    size = count * STATE_RECORD.size
+    world.enemies.capacity = cap
+    world.enemies.unpack_state(data[offset:offset + size])
+    offset += size
+
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    tilemaps = []
+    for _ in range(count):
+        origin_x, cols, rows = TILEMAP.unpack_from(data, offset)
+        offset += TILEMAP.size
+        tilemaps.append((origin_x, cols, rows, data[offset:offset + cols * rows]))
+        offset += cols * rows
+    _restore_level(world, level_index, difficulty, tilemaps)
+
+    world.tick = tick
+    world.time = tick * 1000 // FPS
+    world.score = score
+    world.difficulty_level = difficulty
+    world.game_over = game_over
+    world.enemy_spawn_timer = spawn_timer
+    world.health_added = health_added
+    world.health_added_timer = health_added_timer
+    world.camera.x = camera_x
+    world.spawn_policy.delay = delay
+    world.spawn_policy.cap = cap
+    world.spawn_policy.batch = batch
+
+
+def _reuse(current, origin_x, cols, rows, tiles):
+    """地形没变时沿用现有的瓦片地图（连同碰撞索引和背景），否则按瓦片重建"""
+    if (current is not None and current.origin_x == origin_x and current.cols == cols and
+            current.rows == rows and current.to_bytes() == tiles):
+        return current
+    tilemap = TileMap.from_bytes(tiles, cols, rows, origin_x)
+    tilemap.grid
+    return tilemap
+
+
+def _restore_level(world, level_index, difficulty, tilemaps):
+    level = world.level
+    if world.scrolling:
+        if level.index != level_index:
+            level = world.level = ChunkedLevel(world.seed, level_index, difficulty)
+        level.difficulty = difficulty
+        width = level.chunk_width
+        level.set_chunks({origin_x // width: _reuse(level.chunks.get(origin_x // width), origin_x, cols, rows, tiles)
+                          for origin_x, cols, rows, tiles in tilemaps})
+    else:
+        world.level = _reuse(level, *tilemaps[0])
+    if world.level_index != level_index:
+        world.level_index = level_index
+        # 预生成的候选关卡对应的是读档前的关卡
+        if world.prefetcher:
+            world.prefetcher.request(level_index + 1, difficulty + 1)
+            world.prefetcher.request(level_index + 1, 1)
+
+
+class Rewind:
+    """最近 seconds 秒的存档环形缓冲（每 interval 帧一份），用于倒带"""
+
+    def __init__(self, seconds=10, interval=1):
+        self.interval = interval
+        self.states = deque(maxlen=seconds * FPS // interval)
+
+    def record(self, world):
+        if world.tick % self.interval == 0:
+            self.states.append(dump(world))
+
+    def rewind(self, world):
+        """退回到比当前更早的最近一份存档，返回是否成功"""
+        while self.states and tick_of(self.states[-1]) >= world.tick:
+            self.states.pop()
+        if not self.states:
+            return False
+        restore(world, self.states.pop())
+        return True
@@ -0,0 +1,76 @@
+# spatial.py
+from constants import BLOCK_SIZE
+
+# 方块数量不超过该值时直接线性扫描，比逐格查表更快
+LINEAR_SCAN_LIMIT = 32
+
+
+class SpatialGrid:
+    """均匀网格空间索引：按 BLOCK_SIZE 划分格子，碰撞查询只检查矩形覆盖到的格子
+
+    linear 为 None 时按方块数量自动选择是否退化为线性扫描。
+    """
+
+    def __init__(self, blocks, cell_size=BLOCK_SIZE, linear=None):
+        self.cell_size = cell_size
+        self.blocks = list(blocks)
+        self.linear = len(self.blocks) <= LINEAR_SCAN_LIMIT if linear is None else linear
+        self._all = tuple(self.blocks)
+        self.cells = {}
+        # 地形是静态的，同一格子范围的查询结果可以直接复用
+        self._query_cache = {}
+        for block in self.blocks:
+            for cell in self._cells_for(block.rect):
+                self.cells.setdefault(cell, []).append(block)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def _cells_for(self, rect):
+        """矩形覆盖到的所有格子坐标"""
+        size = self.cell_size
+        x0 = rect.left // size
+        y0 = rect.top // size
+        x1 = max(rect.right - 1, rect.left) // size
+        y1 = max(rect.bottom - 1, rect.top) // size
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                yield cx, cy
+
+    def query(self, rect):
+        """返回可能与 rect 相交的方块（按格子扫描顺序，结果确定）"""
+        if self.linear:
+            return self._all
+        size = self.cell_size
+        left = rect.left
+        top = rect.top
+        key = (left // size, top // size,
+               max(rect.right - 1, left) // size, max(rect.bottom - 1, top) // size)
+        found = self._query_cache.get(key)
+        if found is None:
+            found = self._collect(*key)
+            self._query_cache[key] = found
+        return found
+
+    def _collect(self, x0, y0, x1, y1):
+        """收集格子范围内的所有方块（去重）"""
+        cells = self.cells
+        found = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for block in bucket:
+                        if block not in found:
+                            found.append(block)
+        return tuple(found)
+
+    def collide_any(self, rect):
+        """rect 是否与任意方块相交"""
+        for block in self.query(rect):
+            if rect.colliderect(block.rect):
+                return True
+        return False
@@ -0,0 +1,263 @@
+# swarm.py
+from enemy import Enemy
+from animation import LEFT, RIGHT
+from enemy_pool import STATE_RECORD
+from constants import CHARACTER_SCALE, GRAVITY, MAX_ENEMIES
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖
+    np = None
+
+
+def _state_dtype():
+    """与 EnemyPool 的 STATE_RECORD 逐字节相同的结构化类型，两种敌人系统的存档可以互换"""
+    dtype = np.dtype([("x", "<i4"), ("y", "<i4"), ("velocity_y", "<f8"), ("direction", "i1"), ("facing", "i1"),
+                      ("animation_frame", "<i2"), ("consecutive_collisions", "<i2"), ("on_ground", "?")])
+    assert dtype.itemsize == STATE_RECORD.size
+    return dtype
+
+
+def _round(values):
+    """与 pygame.Rect 赋值浮点数时的取整方式一致（四舍五入，.5 远离零）"""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+
+class EnemySwarm:
+    """批量敌人系统：位置、速度、方向等状态存放在 NumPy 数组中，整群一起更新
+
+    行为与 Enemy.move 一致，接口与 EnemyPool 相同，
+    适合同屏成千上万个敌人。
+    """
+
+    def __init__(self, capacity=MAX_ENEMIES, width=16, height=16, gravity=GRAVITY):
+        if np is None:
+            raise ImportError("EnemySwarm 需要安装 numpy")
+        self.capacity = capacity
+        self.width = width * CHARACTER_SCALE
+        self.height = height * CHARACTER_SCALE
+        self.gravity = gravity
+        self.count = 0
+
+        # 共享一个模板敌人的属性和动画
+        template = Enemy(0, 0, width, height)
+        self.speed = template.speed
+        self.walk = template.walk
+        self.animation_period = template.animation_period
+
+        self._state_dtype = _state_dtype()
+        self._allocate(max(capacity, 16))
+        self._terrain_source = None
+        self._terrain = None
+
+    def _allocate(self, size):
+        """分配（或扩容）数组"""
+        def grow(old, dtype):
+            new = np.zeros(size, dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.x = grow(getattr(self, "x", None), np.int64)
+        self.y = grow(getattr(self, "y", None), np.int64)
+        self.velocity_y = grow(getattr(self, "velocity_y", None), np.float64)
+        self.direction = grow(getattr(self, "direction", None), np.int8)
+        self.facing = grow(getattr(self, "facing", None), np.int8)  # 当前显示的朝向
+        self.animation_frame = grow(getattr(self, "animation_frame", None), np.int16)
+        self.consecutive_collisions = grow(getattr(self, "consecutive_collisions", None), np.int16)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y):
+        """在 (x, y) 生成一个敌人，返回其下标；已达上限时返回 None"""
+        if self.count >= self.capacity:
+            return None
+        if self.count >= len(self.x):
+            self._allocate(len(self.x) * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.velocity_y[i] = 0
+        self.direction[i] = LEFT
+        self.facing[i] = LEFT
+        self.animation_frame[i] = 0
+        self.consecutive_collisions[i] = 0
+        self.count += 1
+        return i
+
+    def clear(self):
+        self.count = 0
+
+    def _terrain_arrays(self, blocks):
+        """地形的 AABB 数组（地形对象不变时复用）"""
+        if blocks is not self._terrain_source:
+            rects = [block.rect for block in blocks]
+            self._terrain = (np.array([r.left for r in rects], np.int64).reshape(1, -1),
+                             np.array([r.top for r in rects], np.int64).reshape(1, -1),
+                             np.array([r.right for r in rects], np.int64).reshape(1, -1),
+                             np.array([r.bottom for r in rects], np.int64).reshape(1, -1))
+            self._terrain_source = blocks
+        return self._terrain
+
+    @staticmethod
+    def _overlap(terrain, x, y, w, h):
+        """每个矩形与每个地形块是否相交（与 Rect.colliderect 相同的开区间判定），返回 (敌人数, 方块数)"""
+        left, top, right, bottom = terrain
+        x = x.reshape(-1, 1)
+        y = y.reshape(-1, 1)
+        return (x < right) & (x + w > left) & (y < bottom) & (y + h > top)
+
+    def update(self, blocks, screen_width, left=0):
+        """移动所有敌人（活动范围 left 到 screen_width）"""
+        n = self.count
+        if n == 0:
+            return
+        w, h = self.width, self.height
+        terrain = self._terrain_arrays(blocks)
+
+        # 重力：与逐个方块检测一致，只有第一个相交的方块会修正位置（之后速度已归零）
+        vy = self.velocity_y[:n] + self.gravity
+        x = self.x[:n]
+        y = _round(self.y[:n] + vy)
+        hits = self._overlap(terrain, x, y, w, h)
+        first = hits.argmax(axis=1)
+        resolve = hits.any(axis=1) & (vy != 0)
+        down = resolve & (vy > 0)
+        up = resolve & (vy < 0)
+        y[down] = terrain[1][0, first[down]] - h
+        y[up] = terrain[3][0, first[up]]
+        vy[resolve] = 0
+
+        # 只有站在地面上的敌人才会水平移动
+        g = np.nonzero(down)[0]
+        direction = self.direction[:n]
+        facing = self.facing[:n]
+        consecutive = self.consecutive_collisions[:n]
+        anim = self.animation_frame[:n]
+        if len(g):
+            anim[g] = (anim[g] + 1) % self.animation_period
+            gd = direction[g]
+            facing[g] = gd
+            old_x = x[g]
+            gx = old_x + gd * self.speed
+            gy = y[g]
+            gc = consecutive[g]
+
+            # 撞墙：回退并掉头，连续撞墙过多时向上挪一点
+            side = self._overlap(terrain, gx, gy, w, h).any(axis=1)
+            gx[side] = old_x[side]
+            gd[side] = -gd[side]
+            gc[side] += 1
+            stuck = side & (gc > 3)
+            gy[stuck] -= 1
+            gc[stuck] = 0
+
+            # 没撞墙：检查前方脚下是否悬空
+            free = ~side
+            gc[free] = 0
+            edge = self._overlap(terrain, gx, gy + h, w, 1).any(axis=1)
+            turn = free & ~edge
+            gd[turn] = -gd[turn]
+
+            # 不移出屏幕
+            at_left = gx < left
+            gx[at_left] = left
+            gd[at_left] = RIGHT
+            at_right = ~at_left & (gx + w > screen_width)
+            gx[at_right] = screen_width - w
+            gd[at_right] = LEFT
+
+            x[g] = gx
+            y[g] = gy
+            direction[g] = gd
+            consecutive[g] = gc
+
+        # x、direction 等是数组切片视图，已原地修改；y 和速度是新数组
+        self.y[:n] = y
+        self.velocity_y[:n] = vy
+
+    def near(self, rect):
+        """粗筛：可能与 rect 接触的敌人，按位置排序，返回 (x, y, 宽, 高, 下标)"""
+        n = self.count
+        if n == 0:
+            return []
+        w, h = self.width, self.height
+        x = self.x[:n]
+        y = self.y[:n]
+        index = np.nonzero((x < rect.right) & (x + w > rect.left) & (y + h > rect.top - h))[0]
+        if len(index) == 0:
+            return []
+        # 与 EnemyPool 相同的排序键：位置、垂直速度、朝向
+        order = np.lexsort((self.direction[index] < 0, self.velocity_y[index], y[index], x[index]))
+        index = index[order]
+        return [(cx, cy, w, h, i) for cx, cy, i in zip(x[index].tolist(), y[index].tolist(), index.tolist())]
+
+    def remove(self, indices):
+        """移除一批敌人（下标为本帧 near 返回的下标），保持其余敌人的顺序"""
+        if not indices:
+            return
+        n = self.count
+        keep = np.ones(n, np.bool_)
+        keep[indices] = False
+        m = int(keep.sum())
+        for array in (self.x, self.y, self.velocity_y, self.direction, self.facing,
+                      self.animation_frame, self.consecutive_collisions):
+            array[:m] = array[:n][keep]
+        self.count = m
+
+    def cull(self, left, right):
+        """移除完全离开 left 到 right 范围的敌人，返回移除数量"""
+        n = self.count
+        x = self.x[:n]
+        gone = np.nonzero((x + self.width <= left) | (x >= right))[0]
+        self.remove(gone.tolist())
+        return len(gone)
+
+    def sprites(self, camera=None):
+        """视野内敌人的 (图片, 屏幕坐标) 列表"""
+        n = self.count
+        if n == 0:
+            return []
+        x = self.x[:n]
+        shown = slice(None)
+        offset = 0
+        if camera is not None:
+            offset = camera.x
+            shown = np.nonzero(camera.visible(x, self.width))[0]
+        left, right = self.walk[LEFT], self.walk[RIGHT]
+        frames = (self.animation_frame[:n][shown] // left.ticks_per_frame).tolist()
+        sprites = [(left if f < 0 else right).frames[i] for f, i in zip(self.facing[:n][shown].tolist(), frames)]
+        positions = zip((x[shown] - offset).tolist(), self.y[:n][shown].tolist())
+        return list(zip(sprites, positions))
+
+    def draw(self, renderer, camera=None):
+        """把视野内的敌人提交到渲染队列"""
+        renderer.submit_many(self.sprites(camera))
+
+    def pack_state(self):
+        """全部敌人编码为 STATE_RECORD 记录"""
+        n = self.count
+        records = np.empty(n, self._state_dtype)
+        for name in ("x", "y", "velocity_y", "direction", "facing", "animation_frame", "consecutive_collisions"):
+            records[name] = getattr(self, name)[:n]
+        # 不跟踪着地状态（Enemy.move 每帧都会重新检测），记为 False
+        records["on_ground"] = False
+        return records.tobytes()
+
+    def unpack_state(self, data):
+        """按 pack_state（或 EnemyPool.pack_state）的结果恢复敌人"""
+        records = np.frombuffer(data, self._state_dtype)
+        n = len(records)
+        if n > len(self.x):
+            self._allocate(n)
+        for name in ("x", "y", "velocity_y", "direction", "facing", "animation_frame", "consecutive_collisions"):
+            getattr(self, name)[:n] = records[name]
+        self.count = n
+
+    def state(self):
+        """每个敌人的 (x, y, 宽, 高, 垂直速度, 是否朝左)，用于校验和快照"""
+        n = self.count
+        return [(x, y, self.width, self.height, vy, d < 0)
+                for x, y, vy, d in zip(self.x[:n].tolist(), self.y[:n].tolist(),
+                                       self.velocity_y[:n].tolist(), self.direction[:n].tolist())]
@@ -0,0 +1,10 @@
+# conftest.py
+import os
+import sys
+
+# 资源按相对路径加载，测试在游戏目录下运行；不打开真实窗口
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.chdir(GAME_DIR)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,35 @@
+# test_contact.py
+import random
+from contact import resolve_contacts, DAMAGED, STOMPED
+from player import Player
+
+
+def side_hit(player):
+    """贴着玩家右侧、与玩家同高的敌人"""
+    rect = player.rect
+    return [(rect.right - 10, rect.top, rect.width, rect.height, 0)]
+
+
+def test_side_hit_reports_damage():
+    player = Player(100, 300, 16, 16)
+    events = resolve_contacts(player, side_hit(player), 0, random.Random(0), 3, 0)
+    assert player.health == 2
+    assert [kind for kind, _ in events] == [DAMAGED]
+    assert not player.is_dead
+
+
+def test_invincible_player_takes_no_damage():
+    player = Player(100, 300, 16, 16)
+    resolve_contacts(player, side_hit(player), 0, random.Random(0), 3, 0)
+    events = resolve_contacts(player, side_hit(player), 100, random.Random(0), 3, 0)
+    assert events == []
+    assert player.health == 2
+
+
+def test_stomp():
+    player = Player(100, 300, 16, 16)
+    player.velocity_y = 5
+    rect = player.rect
+    events = resolve_contacts(player, [(rect.left, rect.bottom - 2, rect.width, rect.height, 7)],
+                              0, random.Random(0), 3, 0)
+    assert events == [(STOMPED, 7)]
@@ -0,0 +1,22 @@
+# test_env.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from env import VectorEnv, run, sweep, MAX_EPISODE_TICKS
+from constants import FPS
+
+
+def test_every_instance_finishes_an_episode():
+    with VectorEnv(4, workers=0) as env:
+        _, finished, truncated = run(env, MAX_EPISODE_TICKS)
+    assert all(finished)
+    assert len(truncated) == 4
+    assert all(ticks <= MAX_EPISODE_TICKS for runs in finished for _, ticks in runs)
+
+
+def test_sweep_reports_truncated_episodes():
+    result, = sweep([{"GRAVITY": 0.75}], repeats=2, steps=200, workers=0)
+    assert result["episodes"] == 0 and result["mean_score"] is None
+    assert result["truncated"] == 2
+    assert result["truncated_seconds"] == pytest.approx(200 / FPS)
@@ -0,0 +1,18 @@
+# test_fonts.py
+import fonts
+
+
+def test_missing_font_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(fonts, "CACHE_PATH", str(tmp_path / "font.json"))
+    monkeypatch.setattr(fonts, "find_font_path", lambda: None)
+    assert fonts.resolve_font_path() is None
+
+    # 之后装上了中文字体
+    font = tmp_path / "cjk.ttf"
+    font.write_bytes(b"")
+    monkeypatch.setattr(fonts, "find_font_path", lambda: str(font))
+    assert fonts.resolve_font_path() == str(font)
+
+    # 找到的字体会被缓存，不再扫描
+    monkeypatch.setattr(fonts, "find_font_path", lambda: None)
+    assert fonts.resolve_font_path() == str(font)
@@ -0,0 +1,87 @@
+# test_level.py
+import random
+import time
+from collections import deque
+import pytest
+import level
+from level import level_for, generate_platforms
+from tilemap import TileMap
+from world import InputState, PLAYER_START
+from player import Player
+
+# 地面上可做的输入（起跳与否 × 左/不动/右）；空中起跳无效，只需左/不动/右
+AIR_INPUTS = [InputState(left, right, False, False) for left, right in ((False, False), (True, False), (False, True))]
+GROUND_INPUTS = AIR_INPUTS + [InputState(left, right, True, False) for left, right, _, _ in AIR_INPUTS]
+
+
+def reachable_spans(tilemap):
+    """用真实的 Player.move 对 (位置, 垂直速度, 着地) 做广度优先搜索，返回玩家能站上去的平台集合"""
+    player = Player(*PLAYER_START, 16, 16)
+    player.max_x = tilemap.origin_x + tilemap.width
+    blocks = tilemap.grid
+    spans = {(tilemap.row_top(row), tilemap.origin_x + col * tilemap.tile_size,
+              tilemap.origin_x + (col + length) * tilemap.tile_size): (row, col)
+             for col, row, length, tile in tilemap.spans()}
+    start = (player.rect.x, player.rect.y, 0.0, False)
+    seen = {start}
+    queue = deque([start])
+    reached = set()
+    while queue:
+        x, y, velocity_y, on_ground = queue.popleft()
+        for inputs in GROUND_INPUTS if on_ground else AIR_INPUTS:
+            player.rect.topleft = (x, y)
+            player.velocity_y = velocity_y
+            player.on_ground = on_ground
+            player.move(blocks, inputs, 0)
+            rect = player.rect
+            state = (rect.x, rect.y, player.velocity_y, player.on_ground)
+            if state in seen:
+                continue
+            seen.add(state)
+            queue.append(state)
+            if player.on_ground:
+                for (top, left, right), span in spans.items():
+                    if top == rect.bottom and left < rect.right and rect.left < right:
+                        reached.add(span)
+    return reached, set(spans.values())
+
+
+@pytest.mark.parametrize("difficulty", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(15))
+def test_every_platform_reachable(seed, difficulty):
+    reached, spans = reachable_spans(level_for(seed, 0, difficulty))
+    assert reached == spans
+
+
+def wide_map(cols):
+    tilemap = TileMap(cols=cols)
+    tilemap.fill(0, tilemap.rows - 1, cols)
+    return tilemap
+
+
+@pytest.mark.parametrize("difficulty", [1, 3])
+def test_many_platforms_bounded(difficulty, monkeypatch):
+    """平台多到放不下时，兜底扫描不会反复从头扫描（每个候选位置最多检查一次）"""
+    calls = [0]
+    try_place = level._try_place
+
+    def counted(*args):
+        calls[0] += 1
+        return try_place(*args)
+
+    monkeypatch.setattr(level, "_try_place", counted)
+    start = time.perf_counter()
+    platforms = generate_platforms(300, difficulty, wide_map(400), random.Random(0))
+    elapsed = time.perf_counter() - start
+    assert len(platforms) > 150
+    # 随机尝试 MAX_ATTEMPTS × 300 次，加上所有锚点跳跃范围内的候选位置各一次，约 1.5 万到 1.8 万次
+    assert calls[0] < 30000
+    assert elapsed < 1.0
+
+
+def test_many_platforms_reachable():
+    tilemap = wide_map(60)
+    generate_platforms(40, 2, tilemap, random.Random(1))
+    reached, spans = reachable_spans(tilemap)
+    assert len(spans) > 10
+    assert reached == spans
@@ -0,0 +1,33 @@
+# test_swarm.py
+import pytest
+from world import World
+from benchmark import scripted_input, run_right, make_world
+
+pytest.importorskip("numpy")
+
+
+def assert_same_state(pool, swarm, tick):
+    """两个世界逐项相同（敌人状态与存储顺序无关）"""
+    assert sorted(pool.enemies.state()) == sorted(swarm.enemies.state()), tick
+    assert (pool.score, pool.difficulty_level, pool.game_over) == \
+        (swarm.score, swarm.difficulty_level, swarm.game_over), tick
+    assert (tuple(pool.player.rect), pool.player.health) == (tuple(swarm.player.rect), swarm.player.health), tick
+
+
+def run_both(pool, swarm, ticks, script=scripted_input):
+    for tick in range(ticks):
+        inputs = script(tick)
+        pool.step(inputs)
+        swarm.step(inputs)
+        assert_same_state(pool, swarm, tick)
+
+
+@pytest.mark.parametrize("seed, scrolling", [(2, False), (6, False), (3, True)])
+def test_backends_match_every_tick(seed, scrolling):
+    run_both(World(seed, scrolling=scrolling), World(seed, swarm=True, scrolling=scrolling), 1800,
+             run_right if scrolling else scripted_input)
+
+
+def test_backends_match_with_crowd():
+    """地面上铺满 200 个敌人，玩家常驻无敌"""
+    run_both(make_world(enemies=200), make_world(enemies=200, swarm=True), 600)
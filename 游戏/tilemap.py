@@ -0,0 +1,121 @@
+# tilemap.py
+import pygame
+from block import Block
+from spatial import SpatialGrid
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BLOCK_SIZE, SKY_BLUE
+
+# 瓦片 id
+EMPTY = 0
+GROUND = 1
+
+
+class TileMap:
+    """紧凑的瓦片地图：每个格子存一个瓦片 id，碰撞使用合并后的水平区间"""
+
+    def __init__(self, cols=None, rows=None, tile_size=BLOCK_SIZE, origin_x=0):
+        self.tile_size = tile_size
+        self.origin_x = origin_x  # 第 0 列左边的世界 x 坐标（滚动模式的区块不从 0 开始）
+        self.cols = cols if cols is not None else -(-SCREEN_WIDTH // tile_size)
+        self.rows = rows if rows is not None else -(-SCREEN_HEIGHT // tile_size)
+        # 网格底边与屏幕底边对齐，这样地面刚好落在最后一行
+        self.origin_y = SCREEN_HEIGHT - self.rows * tile_size
+        self.tiles = [bytearray(self.cols) for _ in range(self.rows)]
+        self._blocks = None
+        self._grid = None
+        self._background = None
+
+    @classmethod
+    def from_bytes(cls, data, cols, rows, origin_x=0):
+        """由 to_bytes 的结果还原（碰撞矩形和背景按需重新生成，贴图来自共享缓存）"""
+        tilemap = cls(cols, rows, origin_x=origin_x)
+        tilemap.tiles = [bytearray(data[row * cols:(row + 1) * cols]) for row in range(rows)]
+        return tilemap
+
+    def to_bytes(self):
+        """全部瓦片 id 按行拼接"""
+        return b"".join(self.tiles)
+
+    def row_at(self, y):
+        """像素 y 坐标所在的行"""
+        return (y - self.origin_y) // self.tile_size
+
+    def row_top(self, row):
+        """某一行顶部的像素 y 坐标"""
+        return self.origin_y + row * self.tile_size
+
+    def get(self, col, row):
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.tiles[row][col]
+        return EMPTY
+
+    def fill(self, col, row, length, tile=GROUND):
+        """从 (col, row) 开始向右填充 length 个瓦片"""
+        line = self.tiles[row]
+        for c in range(max(col, 0), min(col + length, self.cols)):
+            line[c] = tile
+        self._blocks = None
+        self._grid = None
+        self._background = None
+
+    def spans(self):
+        """按行合并连续的同种瓦片，返回 (列, 行, 长度, 瓦片id) 列表"""
+        result = []
+        for row, line in enumerate(self.tiles):
+            col = 0
+            while col < self.cols:
+                tile = line[col]
+                if tile == EMPTY:
+                    col += 1
+                    continue
+                start = col
+                while col < self.cols and line[col] == tile:
+                    col += 1
+                result.append((start, row, col - start, tile))
+        return result
+
+    @property
+    def blocks(self):
+        """每个合并区间对应一个 Block（一个平台只有一个矩形）"""
+        if self._blocks is None:
+            size = self.tile_size
+            self._blocks = [Block(self.origin_x + col * size, self.row_top(row), length * size, size, tile_size=size)
+                            for col, row, length, tile in self.spans()]
+        return self._blocks
+
+    @property
+    def grid(self):
+        """用于碰撞查询的空间索引"""
+        if self._grid is None:
+            self._grid = SpatialGrid(self.blocks)
+        return self._grid
+
+    @property
+    def background(self):
+        """天空和所有地形预先烘焙成的一张背景图（地形变化时才重新生成）"""
+        if self._background is None:
+            self._background = self.render_background()
+        return self._background
+
+    @property
+    def width(self):
+        """地图的像素宽度"""
+        return self.cols * self.tile_size
+
+    def render_background(self):
+        """把天空和地形绘制到一张与地图同宽、与屏幕同高的 Surface 上"""
+        surface = pygame.Surface((self.width, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(SKY_BLUE)
+        for block in self.blocks:
+            surface.blit(block.image, (block.rect.x - self.origin_x, block.rect.y))
+        return surface
+
+    @property
+    def backgrounds(self):
+        """背景图及其世界 x 坐标的元组（渲染线程据此自行拼接，不访问关卡对象）"""
+        return ((self.background, self.origin_x),)
+
+    def view(self, camera):
+        """当前应显示的背景和它是否变化；单屏地图不随摄像机滚动"""
+        return self.background, False
@@ -1,17 +1,29 @@
 # utils.py
 import pygame
 import os
+import assets
 from constants import CHARACTER_SCALE
 
 def flip(sprites):
     """翻转精灵列表，用于角色方向变化"""
     return [pygame.transform.flip(sprite, True, False) for sprite in sprites]
 def load_sprite_sheets(dir1, dir2, width, height, direction=False):
+    """加载目录下所有精灵表（结果进程内缓存，多次调用共享同一组 Surface）"""
     path = os.path.join("assets", dir1, dir2)
+    return assets.cached(sprite_sheets_key(dir1, dir2, width, height, direction),
+                         lambda: _load_sprite_sheets(path, width, height, direction))
+
+
+def sprite_sheets_key(dir1, dir2, width, height, direction=False):
+    """load_sprite_sheets 在资源缓存中使用的键（不含 custom 前缀）"""
+    return ("sprite_sheets", os.path.join("assets", dir1, dir2), width, height, direction)
+
+
+def _load_sprite_sheets(path, width, height, direction):
     images = [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
     all_sprites = {}
     for image in images:
-        sprite_sheet = pygame.image.load(os.path.join(path, image)).convert_alpha()
+        sprite_sheet = assets.load_image(os.path.join(path, image))
         sprites = []
 
         # 分割精灵表
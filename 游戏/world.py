@@ -0,0 +1,251 @@
+# world.py
+import random
+import hashlib
+import struct
+import time
+from collections import namedtuple
+import pygame
+from player import Player
+from enemy_pool import EnemyPool, SpawnPolicy
+from contact import resolve_contacts, STOMPED, DAMAGED, HEALTH_BONUS
+from swarm import EnemySwarm
+from level import level_for
+from camera import Camera
+from chunks import ChunkedLevel
+from prefetch import LevelPrefetcher
+from profiler import NULL_PROFILER
+from constants import *
+
+CHARACTER_HEIGHT = int(16 * CHARACTER_SCALE)
+
+# 玩家出生位置（在地面上）
+PLAYER_START = (100, SCREEN_HEIGHT - BLOCK_SIZE - CHARACTER_HEIGHT)
+
+# 初始敌人位置
+INITIAL_ENEMY_POSITIONS = [
+    (200, SCREEN_HEIGHT - BLOCK_SIZE - CHARACTER_HEIGHT),
+    (400, SCREEN_HEIGHT - 150 - CHARACTER_HEIGHT),
+    (600, SCREEN_HEIGHT - 250 - CHARACTER_HEIGHT),
+]
+
+# 定时生成敌人的候选位置
+SPAWN_POSITIONS = [
+    (100, SCREEN_HEIGHT - BLOCK_SIZE - CHARACTER_HEIGHT),
+    (300, SCREEN_HEIGHT - 200 - CHARACTER_HEIGHT),
+    (500, SCREEN_HEIGHT - 150 - CHARACTER_HEIGHT),
+    (700, SCREEN_HEIGHT - 250 - CHARACTER_HEIGHT),
+]
+
+
+class InputState(namedtuple("InputState", "left right jump restart")):
+    """一帧的输入快照"""
+    __slots__ = ()
+
+    @classmethod
+    def from_keys(cls, keys):
+        """从 pygame.key.get_pressed() 的结果构造"""
+        return cls(bool(keys[pygame.K_LEFT]), bool(keys[pygame.K_RIGHT]),
+                   bool(keys[pygame.K_SPACE]), bool(keys[pygame.K_r]))
+
+
+NO_INPUT = InputState(False, False, False, False)
+
+
+class World:
+    """游戏世界：不依赖窗口和真实时间，每次 step 按固定时间步推进一帧"""
+
+    def __init__(self, seed=None, profiler=NULL_PROFILER, prefetch=False, swarm=False, scrolling=False,
+                 gravity=GRAVITY, jump_power=JUMP_POWER, spawn_delay=ENEMY_SPAWN_DELAY):
+        # 整局游戏共用一个带种子的随机数生成器，相同种子 + 相同输入 = 完全相同的一局
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.profiler = profiler
+        # scrolling=True 时世界向右无限延伸：摄像机跟随玩家，地形按区块生成和卸载
+        self.scrolling = scrolling
+        self.camera = Camera()
+        # 可选：后台线程提前生成下一关，关卡切换时不卡帧（滚动模式的区块很小，直接生成）
+        self.prefetcher = LevelPrefetcher(self.seed) if prefetch and not scrolling else None
+        self.tick = 0
+        self.time = 0  # 模拟时钟（毫秒）
+        self.max_health = MAX_HEALTH
+        self.spawn_policy = SpawnPolicy(spawn_delay)
+
+        # 关卡切换统计
+        self.level_index = -1
+        self.level_switches = 0
+        self.last_switch_ms = 0.0
+        self.worst_switch_ms = 0.0
+
+        # 初始化玩家（位置在地面上）
+        self.player = Player(*PLAYER_START, 16, 16)
+        # 物理参数可按世界调整（参数扫描用），关卡生成仍按默认常量保证可达
+        self.player.gravity = gravity
+        self.player.jump_power = jump_power
+        # swarm=True 时使用 NumPy 批量敌人系统（需要 numpy）
+        cap = self.spawn_policy.cap
+        self.swarm = swarm
+        self.enemies = EnemySwarm(cap, gravity=gravity) if swarm else EnemyPool(cap, gravity=gravity)
+        self.reset_level()
+
+        # 敌人生成计时器
+        self.enemy_spawn_timer = 0
+
+        # 生命加成相关变量
+        self.health_added = False  # 是否添加了生命
+        self.health_added_timer = 0  # 生命加成提示计时器
+
+    def reset_level(self):
+        """重置关卡相关状态（开局与重新开始共用）"""
+        self.difficulty_level = 1
+        self.switch_level()
+        if self.scrolling:
+            # 新的一局从头开始，玩家回到出生点
+            self.player.rect.topleft = PLAYER_START
+            self.scroll()
+        self.enemies.clear()
+        for x, y in INITIAL_ENEMY_POSITIONS:
+            self.enemies.spawn(x, y)
+        self.score = 0
+        self.game_over = False
+
+    def restart(self):
+        """游戏结束后重新开始"""
+        self.player.health = 3
+        self.player.is_dead = False
+        self.reset_level()
+
+    def switch_level(self):
+        """切换到当前难度的下一关；有预生成器时只是交换引用；滚动模式下换成新的区块关卡"""
+        start = time.perf_counter()
+        index = self.level_index + 1
+        with self.profiler.phase("level_gen"):
+            if self.scrolling:
+                self.camera.reset()
+                self.level = ChunkedLevel(self.seed, index, self.difficulty_level)
+                self.level.update(self.camera)
+            elif self.prefetcher:
+                self.level = self.prefetcher.take(index, self.difficulty_level)
+            else:
+                self.level = level_for(self.seed, index, self.difficulty_level)
+        self.level_index = index
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        self.worst_switch_ms = max(self.worst_switch_ms, self.last_switch_ms)
+        self.level_switches += 1
+
+        # 提前生成下一次可能用到的关卡：难度提升或重新开始
+        if self.prefetcher:
+            self.prefetcher.request(index + 1, self.difficulty_level + 1)
+            self.prefetcher.request(index + 1, 1)
+
+    def close(self):
+        """释放后台资源"""
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+
+    def scroll(self):
+        """滚动模式：摄像机跟随玩家，按需生成/卸载区块，回收离开已加载区域的敌人"""
+        camera = self.camera
+        level = self.level
+        if camera.follow(self.player.rect) and level.update(camera):
+            self.enemies.cull(level.left, level.right)
+        # 玩家不能退回摄像机左边（那里的区块随时会被卸载）
+        self.player.min_x = camera.x
+        self.player.max_x = level.right
+
+    @property
+    def bounds(self):
+        """敌人的水平活动范围 (左, 右)"""
+        if self.scrolling:
+            return self.level.left, self.level.right
+        return 0, SCREEN_WIDTH
+
+    @property
+    def blocks(self):
+        """当前关卡用于碰撞查询的地形"""
+        return self.level.grid
+
+    def step(self, inputs=NO_INPUT):
+        """推进一个固定时间步"""
+        self.tick += 1
+        self.time = self.tick * 1000 // FPS
+
+        if self.game_over:
+            if inputs.restart:
+                self.restart()
+            return
+
+        current_time = self.time
+        player = self.player
+        profiler = self.profiler
+        with profiler.phase("player"):
+            player.move(self.blocks, inputs, current_time)
+        if self.scrolling:
+            with profiler.phase("chunks"):
+                self.scroll()
+
+        # 检查是否需要提升难度
+        if self.score % SCORE_TO_INCREASE_DIFFICULTY == 0 and self.score > 0:
+            new_difficulty = (self.score // SCORE_TO_INCREASE_DIFFICULTY) + 1
+            if new_difficulty > self.difficulty_level:
+                self.difficulty_level = new_difficulty
+                if self.scrolling:
+                    # 不打断当前地形，之后生成的区块变难
+                    self.level.difficulty = new_difficulty
+                else:
+                    self.switch_level()
+
+        # 更新敌人
+        blocks = self.blocks
+        enemies = self.enemies
+        left, right = self.bounds
+        with profiler.phase("enemies"):
+            enemies.update(blocks, right, left)
+
+        # 玩家与敌人的接触：粗筛附近的敌人，每个只判定一次
+        with profiler.phase("contacts"):
+            events = resolve_contacts(player, enemies.near(player.rect), current_time,
+                                      self.rng, self.max_health, HEALTH_ADD_PROBABILITY)
+            self.apply_contacts(events)
+
+        # 敌人生成
+        if self.spawn_policy.due(current_time, self.enemy_spawn_timer):
+            with profiler.phase("spawn"):
+                for _ in range(self.spawn_policy.count(len(enemies))):
+                    spawn_pos = SPAWN_POSITIONS[self.rng.randint(0, len(SPAWN_POSITIONS) - 1)]
+                    enemies.spawn(self.camera.x + spawn_pos[0], spawn_pos[1])
+            self.enemy_spawn_timer = current_time
+
+        # 检查生命加成提示是否过期
+        if self.health_added and current_time - self.health_added_timer > HEALTH_ADD_DURATION:
+            self.health_added = False
+
+    def apply_contacts(self, events):
+        """结算接触事件：计分、移除被踩的敌人、加命提示、死亡"""
+        stomped = []
+        for kind, enemy in events:
+            if kind == STOMPED:
+                stomped.append(enemy)
+                self.score += 1
+            elif kind == HEALTH_BONUS:
+                self.health_added = True
+                self.health_added_timer = self.time
+            elif kind == DAMAGED and self.player.health <= 0:
+                self.player.die(self.time)
+                self.game_over = True
+        self.enemies.remove(stomped)
+
+    def checksum(self):
+        """当前状态的摘要，用于校验回放是否与录制完全一致"""
+        player = self.player
+        digest = hashlib.sha256()
+        digest.update(struct.pack("<qiii?", self.tick, self.score, self.difficulty_level,
+                                  player.health, self.game_over))
+        digest.update(struct.pack("<4idd", *player.rect, player.velocity_x, player.velocity_y))
+        # 两种敌人后端删除敌人后的存储顺序不同，按状态排序后再计算
+        for state in sorted(self.enemies.state()):
+            digest.update(struct.pack("<4id?", *state))
+        for line in self.level.tiles:
+            digest.update(line)
+        if self.scrolling:
+            digest.update(struct.pack("<q", self.camera.x))
+        return digest.hexdigest()